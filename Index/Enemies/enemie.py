@@ -2,7 +2,8 @@ import pygame
 import time
 import random  # Importar el módulo random
 from Index.Enemies.style_enemie import EnemyStyle
-from Index.Utils.collision_helper import CollisionHelper
+from Index.Utils.collision_helper import CollisionHelper, platform_boxes, resolve_platform_collisions
+from Index.Utils.render_target import LOGICAL_SIZE
 
 class Enemy:
     # Configuraciones de dificultad
@@ -143,42 +144,22 @@ class Enemy:
         else:
             self.is_attacking = False
 
-    def check_platform_collision(self, platforms):
-        """Check and handle collisions with platforms using screen coordinates"""
-        # Crear rect del enemigo con las dimensiones correctas del sprite
-        enemy_rect = pygame.Rect(
-            self.x,
-            self.y,
-            self.width,
-            self.height
-        )
-        
-        # Variable para rastrear si estamos en el suelo
+    def check_platform_collision(self, platforms, previous=None):
+        """Resolver las colisiones con plataformas con el resolvedor por lotes.
+
+        `platforms` puede ser una lista o el CollisionHelper del mundo, en cuyo
+        caso solo se comprueban las plataformas cercanas. `previous` es la
+        posición (x, y) antes del movimiento de este paso. Una lista vacía no
+        resuelve nada: el estado de apoyo se mantiene hasta la resolución real.
+        """
+        if not isinstance(platforms, CollisionHelper) and not platforms:
+            return self.on_ground
+        previous = [previous or (self.x, self.y)]
         was_on_ground = self.on_ground
-        self.on_ground = False
-        
-        for platform in platforms:
-            if enemy_rect.colliderect(platform.rect):
-                # Obtener la profundidad de la colisión en cada eje
-                dx = min(enemy_rect.right - platform.rect.left, platform.rect.right - enemy_rect.left)
-                dy = min(enemy_rect.bottom - platform.rect.top, platform.rect.bottom - enemy_rect.top)
-                
-                # Determinar la dirección de la colisión comparando las profundidades
-                if dx < dy:  # Colisión horizontal
-                    if enemy_rect.centerx < platform.rect.centerx:  # Colisión desde la izquierda
-                        self.x = platform.rect.left - self.width
-                    else:  # Colisión desde la derecha
-                        self.x = platform.rect.right
-                    self.velocity_x = 0
-                else:  # Colisión vertical
-                    if enemy_rect.centery < platform.rect.centery:  # Colisión desde arriba
-                        self.y = platform.rect.top
-                        self.velocity_y = 0
-                        self.is_jumping = False
-                        self.on_ground = True
-                    else:  # Colisión desde abajo
-                        self.y = platform.rect.bottom
-                        self.velocity_y = 0
+        if isinstance(platforms, CollisionHelper):
+            platforms.resolve_platforms([self], previous)
+        else:
+            resolve_platform_collisions([self], previous, platform_boxes(platforms))
                 
         # Si acabamos de dejar el suelo, aplicar un pequeño impulso hacia arriba
         if was_on_ground and not self.on_ground and self.velocity_y >= 0:
@@ -312,6 +293,7 @@ class Enemy:
         state_actions[self.state](dt)
 
         # Apply gravity and update position
+        previous = (self.x, self.y)
         if not self.on_ground:
             self.velocity_y += self.gravity * dt
         self.x += self.velocity_x * dt
@@ -321,7 +303,7 @@ class Enemy:
         self.constrain_to_screen()
 
         # Check collisions with platforms
-        self.check_platform_collision(platforms)
+        self.check_platform_collision(platforms, previous)
 
         # Apply friction
         self.velocity_x *= self.friction
@@ -338,7 +320,7 @@ class Enemy:
 
     def constrain_to_screen(self):
         """Ensure the enemy stays within screen bounds."""
-        screen_width, screen_height = 800, 450
+        screen_width, screen_height = LOGICAL_SIZE
         if self.x < 0:
             self.x, self.velocity_x = 0, 0
         elif self.x + self.width > screen_width:
@@ -366,6 +348,7 @@ class Enemy:
 
             self.invulnerable = True
             self.invulnerable_timer = self.invulnerable_duration
+            self.style.hit_flash = 1.0  # Destello al recibir daño
 
     def reset_on_death(self):
         """Reset enemy stats when it dies."""
@@ -377,4 +360,4 @@ class Enemy:
 
     def draw(self, screen):
         """Dibujar al enemigo en la pantalla con coordenadas correctas"""
-        self.style.draw(screen, self.x, self.y)
+        return self.style.draw(screen, self.x, self.y)
@@ -1,6 +1,8 @@
-import pygame
 import math
 import random
+from Index.Utils.sprite_atlas import get_atlas, build_palette
+from Index.Utils.particle_engine import get_particle_system
+from Index.Utils.oscillators import get_oscillator_bank
 
 class EnemyStyle:
     def __init__(self):
@@ -25,11 +27,18 @@ class EnemyStyle:
             'attack': 0.1
         }
         self.time_since_last_frame = 0
-        self.time_active = 0
+        # Osciladores compartidos del reloj de animación global
+        self.oscillators = get_oscillator_bank()
+        self._glow_wave = self.oscillators.register(3)
+        self._run_wave = self.oscillators.register(10)
+        self._idle_wave = self.oscillators.register(2)
         self.glow_intensity = 0
         self.squash_factor = 1.0
         self.shake_offset = 0
-        self.particles = []
+        self.particle_emitter = get_particle_system().create_emitter()
+        self.facing_right = True
+        self.glow_letters = ('X', 'D')
+        self.hit_flash = 0
         
         # Agregar animaciones mejoradas
         self.animations = {
@@ -98,10 +107,13 @@ class EnemyStyle:
                   "XX  XX     " ]
             ]
         }
+        
+        # Atlas compartido con los frames pre-compilados
+        self.palette_letters = tuple(pixel for pixel in self.colors if pixel != ' ')
+        self.atlas = get_atlas(type(self).__name__, self.animations,
+                               self.pixel_size, self.palette_letters)
 
     def update_animation(self, dt, moving=False, jumping=False, attacking=False):
-        self.time_active += dt
-        
         # Actualizar animación actual
         if attacking:
             self.current_animation = "attack"
@@ -121,15 +133,17 @@ class EnemyStyle:
             self.current_frame = 0
             
         # Actualizar efectos visuales
-        self.glow_intensity = (math.sin(self.time_active * 3) + 1) * 0.5
+        waves = self.oscillators.values
+        self.glow_intensity = (waves[self._glow_wave] + 1) * 0.5
+        self.hit_flash = max(0, self.hit_flash - dt * 6)
         
         # Efecto de squash y stretch
         if jumping:
             self.squash_factor = 1.2
         elif moving:
-            self.squash_factor = 1.0 + math.sin(self.time_active * 10) * 0.1
+            self.squash_factor = 1.0 + waves[self._run_wave] * 0.1
         else:
-            self.squash_factor = 1.0 + math.sin(self.time_active * 2) * 0.05
+            self.squash_factor = 1.0 + waves[self._idle_wave] * 0.05
             
         # Efecto de vibración al atacar
         if attacking:
@@ -137,30 +151,15 @@ class EnemyStyle:
         else:
             self.shake_offset = 0
             
-        # Actualizar partículas
-        for particle in self.particles[:]:
-            particle['lifetime'] -= dt
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
-                continue
-                
-            particle['x'] += particle['vx'] * dt
-            particle['y'] += particle['vy'] * dt
-            particle['alpha'] = int(255 * (particle['lifetime'] / particle['max_lifetime']))
-            
-        # Generar nuevas partículas durante el ataque
+        # Generar nuevas partículas durante el ataque (el motor compartido las integra)
         if attacking and random.random() < 0.3:
             angle = random.uniform(0, math.pi * 2)
             speed = random.uniform(50, 150)
-            self.particles.append({
-                'x': 0,
-                'y': 0,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'lifetime': random.uniform(0.2, 0.5),
-                'max_lifetime': 0.5,
-                'alpha': 255
-            })
+            self.particle_emitter.emit(0, 0, self.colors['G'],
+                                       math.cos(angle) * speed,
+                                       math.sin(angle) * speed,
+                                       random.uniform(0.2, 0.5),
+                                       size=5, max_lifetime=0.5)
 
     def draw(self, screen, x, y):
         # Aplicar transformaciones
@@ -170,35 +169,12 @@ class EnemyStyle:
         height_diff = scaled_height - self.height
         draw_y -= height_diff
         
-        # Dibujar partículas
-        for particle in self.particles:
-            color = (*self.colors['G'][:3], particle['alpha'])
-            pos = (int(draw_x + particle['x']), int(draw_y + particle['y']))
-            pygame.draw.circle(screen, color, pos, 2)
-        
-        # Dibujar sprite principal con efectos
-        frames = self.animations[self.current_animation]
-        frame = frames[self.current_frame]
+        # Las partículas se dibujan en el pase global, relativas a este origen
+        self.particle_emitter.set_origin(draw_x, draw_y)
         
-        for row_index, row in enumerate(frame):
-            for col_index, pixel in enumerate(row):
-                if pixel in self.colors and self.colors[pixel]:
-                    # Aplicar color base
-                    base_color = self.colors[pixel]
-                    
-                    # Añadir brillo dinámico
-                    if pixel in ['X', 'D']:
-                        glow = int(50 * self.glow_intensity)
-                        color = tuple(min(255, c + glow) for c in base_color)
-                    else:
-                        color = base_color
-                    
-                    # Calcular posición con squash y stretch
-                    pixel_x = draw_x + col_index * self.pixel_size
-                    pixel_y = draw_y + row_index * self.pixel_size * self.squash_factor
-                    
-                    # Dibujar píxel
-                    pygame.draw.rect(screen, color,
-                                  (pixel_x, pixel_y,
-                                   self.pixel_size,
-                                   self.pixel_size * self.squash_factor))
+        # Dibujar variante cacheada; brillo y destello se aplican con la paleta
+        palette = build_palette(self.palette_letters, self.colors, self.glow_letters,
+                                int(50 * self.glow_intensity), self.hit_flash)
+        surface = self.atlas.get_variant(self.current_animation, self.current_frame,
+                                         self.facing_right, self.squash_factor)
+        return self.atlas.blit(screen, surface, palette, (draw_x, draw_y))
@@ -0,0 +1,111 @@
+import pygame
+from typing import Dict, List, Optional
+
+from Index.Utils.sprite_atlas import prepare_surface
+from Index.Utils.text_cache import draw_counter
+
+# Colors
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+YELLOW = (255, 255, 0)
+
+EFFECT_COLORS = {
+    'speed': (255, 255, 0),
+    'jump': (0, 255, 0),
+    'shield': (0, 255, 255)
+}
+
+_MISSING = object()
+
+
+class HUD:
+    """HUD en modo retenido.
+
+    Cada widget (barras de vida, score, combo, nivel y efectos activos) se
+    compone sobre una superficie overlay cacheada solo cuando su valor cambia;
+    el resto de frames el HUD es un único lote de blits desde el overlay.
+    """
+
+    def __init__(self):
+        self.overlay: Optional[pygame.Surface] = None
+        self.values: Dict[str, object] = {}
+        self.widget_rects: Dict[str, pygame.Rect] = {}
+        self.dirty = set()
+
+    def update(self, score, combo, level, player_health, enemy_health, active_effects) -> None:
+        """Registra los valores actuales y marca como sucios los widgets que cambiaron"""
+        values = {
+            'player_health': player_health,
+            'enemy_health': enemy_health,
+            'score': score,
+            'combo': combo,
+            'level': level,
+            # Solo cuentan los segundos enteros que se muestran
+            'effects': tuple((effect_type, int(duration))
+                             for effect_type, duration in active_effects.items() if duration > 0)
+        }
+        for name, value in values.items():
+            if self.values.get(name, _MISSING) != value:
+                self.dirty.add(name)
+        self.values = values
+
+    def invalidate(self) -> None:
+        """Fuerza a recomponer todos los widgets en el próximo dibujado"""
+        self.dirty.update(self.values)
+
+    def draw(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """Recompone los widgets sucios y copia el overlay a la pantalla.
+
+        Devuelve las áreas de todos los widgets visibles más las que ocupaban
+        antes los widgets recompuestos.
+        """
+        if self.overlay is None or self.overlay.get_size() != screen.get_size():
+            self.overlay = prepare_surface(pygame.Surface(screen.get_size(), pygame.SRCALPHA))
+            self.widget_rects.clear()
+            self.invalidate()
+
+        vacated = []
+        for name in self.dirty:
+            old_rect = self.widget_rects.pop(name, None)
+            if old_rect is not None:
+                self.overlay.fill((0, 0, 0, 0), old_rect)
+                vacated.append(old_rect)
+            rect = getattr(self, f'_draw_{name}')(self.overlay, self.values[name])
+            if rect is not None and rect.width and rect.height:
+                self.widget_rects[name] = rect
+        self.dirty.clear()
+
+        return vacated + screen.blits([(self.overlay, rect.topleft, rect)
+                                       for rect in self.widget_rects.values()])
+
+    def _draw_health_bar(self, surface, x, health) -> pygame.Rect:
+        pygame.draw.rect(surface, RED, (x, 10, 200, 20))
+        pygame.draw.rect(surface, GREEN, (x, 10, 200 * (health/100), 20))
+        return pygame.Rect(x, 10, 200, 20)
+
+    def _draw_player_health(self, surface, health) -> pygame.Rect:
+        return self._draw_health_bar(surface, 10, health)
+
+    def _draw_enemy_health(self, surface, health) -> pygame.Rect:
+        return self._draw_health_bar(surface, surface.get_width() - 210, health)
+
+    def _draw_score(self, surface, score) -> pygame.Rect:
+        return draw_counter(surface, 'Score: ', str(score), WHITE, (10, 40))
+
+    def _draw_combo(self, surface, combo) -> pygame.Rect:
+        return draw_counter(surface, 'Combo: ', f'{combo}x', YELLOW if combo > 1 else WHITE, (10, 80))
+
+    def _draw_level(self, surface, level) -> pygame.Rect:
+        return draw_counter(surface, 'Level: ', str(level), WHITE, (10, 120))
+
+    def _draw_effects(self, surface, effects) -> Optional[pygame.Rect]:
+        """Dibujar efectos activos debajo del score y combo"""
+        y_offset = 160
+        rect = None
+        for effect_type, seconds in effects:
+            line_rect = draw_counter(surface, f"{effect_type.capitalize()}: ", f"{seconds}s",
+                                     EFFECT_COLORS[effect_type], (10, y_offset))
+            rect = line_rect if rect is None else rect.union(line_rect)
+            y_offset += 30
+        return rect
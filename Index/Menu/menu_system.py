@@ -1,4 +1,5 @@
 import pygame
+from Index.Utils.text_cache import get_font, render_text
 
 # Colors
 WHITE = (255, 255, 255)
@@ -19,14 +20,15 @@ class Button:
     def __init__(self, x, y, width, height, text, font_size=36):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
-        self.font = pygame.font.SysFont(None, font_size)
+        self.font_size = font_size
+        self.font = get_font(None, font_size)
         self.selected = False
         
     def draw(self, screen):
         color = MENU_SELECT if self.selected else MENU_TEXT
-        text_surface = self.font.render(self.text, True, color)
+        text_surface = render_text(self.text, color, self.font_size)
         text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        return screen.blit(text_surface, text_rect)
         
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -52,7 +54,7 @@ class Menu:
         }
 
         # Título del juego
-        self.title_font = pygame.font.SysFont(None, 72)
+        self.title_font = get_font(None, 72)
         self.title_text = "MI JUEGO"
 
     def update_dimensions(self):
@@ -65,17 +67,19 @@ class Menu:
         self.start_y = self.screen_height // 2 - self.button_height
 
     def draw(self, background_func):
+        """Dibuja el menú y devuelve las áreas que cambiaron"""
         # Dibujar fondo
-        background_func(self.screen)
+        rects = list(background_func(self.screen) or [])
 
         # Dibujar título
-        title_surface = self.title_font.render(self.title_text, True, WHITE)
+        title_surface = render_text(self.title_text, WHITE, 72)
         title_rect = title_surface.get_rect(center=(self.screen_width // 2, self.screen_height // 4))
-        self.screen.blit(title_surface, title_rect)
+        rects.append(self.screen.blit(title_surface, title_rect))
 
         # Dibujar botones
         for button in self.buttons.values():
-            button.draw(self.screen)
+            rects.append(button.draw(self.screen))
+        return rects
 
     def handle_event(self, event):
         if event.type == pygame.VIDEORESIZE:
@@ -95,9 +99,11 @@ class Menu:
 class Settings:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.SysFont(None, 36)
+        self.font = get_font(None, 36)
         self.scroll_y = 0
         self.scroll_speed = 20
+        # Scroll del último dibujado, para saber si el contenido se movió
+        self.drawn_scroll_y = None
         self.visible_area = pygame.Rect(0, 100, screen.get_width(), screen.get_height() - 200)
         
         # Dimensiones básicas
@@ -183,30 +189,37 @@ class Settings:
                 element.rect.y = element.rect.y + event.y * self.scroll_speed
                 
     def draw(self, background_func):
+        """Dibuja los ajustes y devuelve las áreas que cambiaron.
+
+        El contenido desplazable cuenta entero como sucio solo cuando cambia el
+        scroll, ya que mueve todos sus elementos a la vez; el resto de frames
+        cuentan los elementos dibujados.
+        """
         # Dibujar fondo
-        background_func(self.screen)
+        rects = list(background_func(self.screen) or [])
         
         # Dibujar título (fijo)
-        title = self.font.render("AJUSTES", True, WHITE)
+        title = render_text("AJUSTES", WHITE, 36)
         title_rect = title.get_rect(center=self.title_pos)
-        self.screen.blit(title, title_rect)
+        rects.append(self.screen.blit(title, title_rect))
+        content_rects = []
         
         # Configurar scissor para el área visible
         pygame.display.get_surface().set_clip(self.visible_area)
         
         # Dibujar subtítulo de resolución
-        resolution_label = self.font.render("RESOLUCIÓN DE PANTALLA", True, WHITE)
+        resolution_label = render_text("RESOLUCIÓN DE PANTALLA", WHITE, 36)
         resolution_rect = resolution_label.get_rect(center=(self.resolution_label_pos[0],
                                                           self.resolution_label_pos[1] - self.scroll_y))
         if self.visible_area.colliderect(resolution_rect):
-            self.screen.blit(resolution_label, resolution_rect)
+            content_rects.append(self.screen.blit(resolution_label, resolution_rect))
         
         # Dibujar subtítulo de dificultad
-        difficulty_label = self.font.render("DIFICULTAD", True, WHITE)
+        difficulty_label = render_text("DIFICULTAD", WHITE, 36)
         difficulty_rect = difficulty_label.get_rect(center=(self.difficulty_label_pos[0],
                                                           self.difficulty_label_pos[1] - self.scroll_y))
         if self.visible_area.colliderect(difficulty_rect):
-            self.screen.blit(difficulty_label, difficulty_rect)
+            content_rects.append(self.screen.blit(difficulty_label, difficulty_rect))
         
         # Dibujar botones de resolución
         for i, button in enumerate(self.resolution_buttons):
@@ -215,10 +228,10 @@ class Settings:
             
             if self.visible_area.colliderect(button_rect):
                 if i == self.current_resolution_index and not self.is_fullscreen:
-                    pygame.draw.rect(self.screen, MENU_SELECT, 
-                                   button_rect.inflate(20, 10), 2)
+                    content_rects.append(pygame.draw.rect(self.screen, MENU_SELECT,
+                                                          button_rect.inflate(20, 10), 2))
                 button.rect = button_rect
-                button.draw(self.screen)
+                content_rects.append(button.draw(self.screen))
         
         # Dibujar botones de dificultad
         for i, button in enumerate(self.difficulty_buttons):
@@ -227,44 +240,52 @@ class Settings:
             
             if self.visible_area.colliderect(button_rect):
                 if i == self.current_difficulty:
-                    pygame.draw.rect(self.screen, MENU_SELECT,
-                                   button_rect.inflate(20, 10), 2)
+                    content_rects.append(pygame.draw.rect(self.screen, MENU_SELECT,
+                                                          button_rect.inflate(20, 10), 2))
                 button.rect = button_rect
-                button.draw(self.screen)
+                content_rects.append(button.draw(self.screen))
         
         # Dibujar botón de pantalla completa
         fullscreen_rect = self.fullscreen_button.rect.copy()
         fullscreen_rect.y -= self.scroll_y
         if self.visible_area.colliderect(fullscreen_rect):
             if self.is_fullscreen:
-                pygame.draw.rect(self.screen, MENU_SELECT,
-                               fullscreen_rect.inflate(20, 10), 2)
+                content_rects.append(pygame.draw.rect(self.screen, MENU_SELECT,
+                                                      fullscreen_rect.inflate(20, 10), 2))
             self.fullscreen_button.rect = fullscreen_rect
-            self.fullscreen_button.draw(self.screen)
+            content_rects.append(self.fullscreen_button.draw(self.screen))
         
         # Restaurar el área de recorte
         pygame.display.get_surface().set_clip(None)
         
+        # Con el scroll quieto, solo cambian los elementos visibles
+        if self.scroll_y != self.drawn_scroll_y:
+            self.drawn_scroll_y = self.scroll_y
+            rects.append(pygame.Rect(self.visible_area))
+        else:
+            rects += [rect.clip(self.visible_area) for rect in content_rects]
+        
         # Dibujar botón de volver (siempre visible)
-        self.back_button.draw(self.screen)
+        rects.append(self.back_button.draw(self.screen))
         
         # Dibujar indicadores de scroll si es necesario
         if self.max_scroll > 0:
             if self.scroll_y > 0:
                 # Flecha arriba
-                pygame.draw.polygon(self.screen, WHITE, [
+                rects.append(pygame.draw.polygon(self.screen, WHITE, [
                     (self.screen.get_width()//2, 110),
                     (self.screen.get_width()//2 - 10, 120),
                     (self.screen.get_width()//2 + 10, 120)
-                ])
+                ]))
             
             if self.scroll_y < self.max_scroll:
                 # Flecha abajo
-                pygame.draw.polygon(self.screen, WHITE, [
+                rects.append(pygame.draw.polygon(self.screen, WHITE, [
                     (self.screen.get_width()//2, self.screen.get_height() - 130),
                     (self.screen.get_width()//2 - 10, self.screen.get_height() - 140),
                     (self.screen.get_width()//2 + 10, self.screen.get_height() - 140)
-                ])
+                ]))
+        return rects
         
     def handle_event(self, event):
         # Manejar scroll
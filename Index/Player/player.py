@@ -1,6 +1,7 @@
 import pygame
 from Index.Player.style_player import PlayerStyle
-from Index.Utils.collision_helper import CollisionHelper
+from Index.Utils.collision_helper import CollisionHelper, platform_boxes, resolve_platform_collisions
+from Index.Utils.render_target import LOGICAL_SIZE
 
 class Player:
     def __init__(self, x=0, y=0):
@@ -29,7 +30,7 @@ class Player:
         self.invulnerable = False
         self.invulnerable_timer = 0
         self.invulnerable_duration = 1.0
-        self.screen_height = 450  # Añadir referencia a la altura de la pantalla
+        self.screen_height = LOGICAL_SIZE[1]  # Altura de la resolución lógica del juego
 
     def move_left(self, dt):
         """Apply left movement force"""
@@ -69,34 +70,20 @@ class Player:
         """Initiate player attack"""
         self.is_attacking = True
 
-    def check_platform_collision(self, platforms):
-        """Check and handle collisions with platforms using screen coordinates"""
-        player_rect = pygame.Rect(
-            self.x,
-            self.y,
-            self.style.width,
-            self.style.height
-        )
-        
-        for platform in platforms:
-            if player_rect.colliderect(platform.rect):
-                if self.velocity_y >= 0:  # Cayendo (velocidad positiva en coordenadas de pantalla)
-                    if self.y <= platform.rect.top:
-                        self.y = platform.rect.top
-                        self.velocity_y = 0
-                        self.is_jumping = False
-                        self.on_ground = True
-                        return True
-
-        if self.velocity_y > 0:  # Si está cayendo en coordenadas de pantalla
-            self.on_ground = False
-        return False
+    def check_platform_collision(self, platforms, previous=None):
+        """Resolve platform collisions through the shared batch resolver.
+
+        `previous` is the (x, y) position before this step's movement.
+        """
+        boxes = platform_boxes(platforms)
+        return bool(resolve_platform_collisions([self], [previous or (self.x, self.y)], boxes)[0])
 
     def update(self, dt, platforms=None):
         """Optimized update method with modularized logic."""
         self.update_timers(dt)
+        previous = (self.x, self.y)
         self.apply_physics(dt)
-        self.handle_collisions(platforms)
+        self.handle_collisions(platforms, previous)
         self.constrain_to_screen()
         self.update_animation(dt)
         self.reset_attack_state()
@@ -131,10 +118,10 @@ class Player:
         if abs(self.velocity_x) < 1:
             self.velocity_x = 0
 
-    def handle_collisions(self, platforms):
+    def handle_collisions(self, platforms, previous=None):
         """Handle collisions with platforms."""
         if platforms:
-            self.check_platform_collision(platforms)
+            self.check_platform_collision(platforms, previous)
 
     def constrain_to_screen(self):
         """Ensure the player stays within screen bounds."""
@@ -164,6 +151,7 @@ class Player:
                 self.health = 0
             self.invulnerable = True
             self.invulnerable_timer = self.invulnerable_duration
+            self.style.hit_flash = 1.0  # Destello al recibir daño
             
             # Knockback hacia arriba (valor negativo en coordenadas de pantalla)
             self.velocity_y = -300  # Knockback vertical
@@ -200,4 +188,5 @@ class Player:
 
     def draw(self, screen):
         """Draw the player on screen with correct coordinates"""
-        self.style.draw(screen, self.x, self.y)
+        self.style.facing_right = self.facing_right
+        return self.style.draw(screen, self.x, self.y)
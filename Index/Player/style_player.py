@@ -1,8 +1,9 @@
-import pygame
 import math
-import time
 import random
-from typing import Dict, List, Tuple
+from typing import Tuple
+from Index.Utils.sprite_atlas import get_atlas, build_palette, build_crossfade_palette
+from Index.Utils.particle_engine import get_particle_system
+from Index.Utils.oscillators import get_oscillator_bank
 
 class PlayerStyle:
     def __init__(
@@ -30,8 +31,12 @@ class PlayerStyle:
         self.squash_stretch = 1.0
         self.glow_intensity = 0
         self.shake_offset = 0
-        self.time_active = 0
-        self.particles = []
+        # Osciladores compartidos del reloj de animación global
+        self.oscillators = get_oscillator_bank()
+        self._glow_wave = self.oscillators.register(3)
+        self._run_wave = self.oscillators.register(12)
+        self._idle_wave = self.oscillators.register(2)
+        self.particle_emitter = get_particle_system().create_emitter()
         self.trail_points = []
         self.max_trail_points = 5
         
@@ -112,11 +117,14 @@ class PlayerStyle:
         self.current_animation = 'idle'
         self.current_frame = 0
         self.time_since_last_frame = 0
-        self.parsed_frames_cache = {}
+        self.facing_right = True
+        self.glow_letters = ('X', 'A')
+        self.hit_flash = 0
+        self.palette_letters = tuple(pixel for pixel in self.colors if pixel != ' ')
+        self.atlas = get_atlas(type(self).__name__, self.animations,
+                               self.pixel_size, self.palette_letters)
 
     def update_animation(self, dt, moving=False, jumping=False, attacking=False):
-        self.time_active += dt
-        
         # Determinar nueva animación y asegurar que la animación de movimiento tenga prioridad correcta
         if attacking:
             new_animation = 'attack'
@@ -149,31 +157,23 @@ class PlayerStyle:
                 self.time_since_last_frame = 0
                 
         # Actualizar efectos visuales
-        self.glow_intensity = (math.sin(self.time_active * 3) + 1) * 0.5
+        waves = self.oscillators.values
+        self.glow_intensity = (waves[self._glow_wave] + 1) * 0.5
+        self.hit_flash = max(0, self.hit_flash - dt * 6)
         
         # Efectos de squash y stretch más pronunciados durante el movimiento
         if jumping:
             self.squash_stretch = 1.2
         elif moving:
-            self.squash_stretch = 1.0 + math.sin(self.time_active * 12) * 0.15  # Aumentado el efecto
+            self.squash_stretch = 1.0 + waves[self._run_wave] * 0.15  # Aumentado el efecto
         else:
-            self.squash_stretch = 1.0 + math.sin(self.time_active * 2) * 0.05
+            self.squash_stretch = 1.0 + waves[self._idle_wave] * 0.05
 
         # Actualizar partículas
         self._update_particles(dt, attacking, moving)
 
     def _update_particles(self, dt, attacking, moving):
-        # Actualizar partículas existentes
-        for particle in self.particles[:]:
-            particle['lifetime'] -= dt
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
-                continue
-            
-            particle['x'] += particle['vx'] * dt
-            particle['y'] += particle['vy'] * dt
-            particle['alpha'] = int(255 * (particle['lifetime'] / particle['max_lifetime']))
-        
+        # El motor compartido integra las partículas; aquí solo se generan
         # Generar partículas según el estado
         if attacking and random.random() < 0.3:
             self._spawn_attack_particles()
@@ -184,27 +184,18 @@ class PlayerStyle:
         for _ in range(3):
             angle = random.uniform(-math.pi/4, math.pi/4)
             speed = random.uniform(100, 200)
-            self.particles.append({
-                'x': 0, 'y': 0,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'lifetime': random.uniform(0.2, 0.4),
-                'max_lifetime': 0.4,
-                'alpha': 255,
-                'type': 'attack'
-            })
+            self.particle_emitter.emit(0, 0, self.colors['W'],
+                                       math.cos(angle) * speed,
+                                       math.sin(angle) * speed,
+                                       random.uniform(0.2, 0.4),
+                                       size=7, max_lifetime=0.4)
 
     def _spawn_movement_particles(self):
-        self.particles.append({
-            'x': random.uniform(-5, 5),
-            'y': self.height,
-            'vx': random.uniform(-20, 20),
-            'vy': random.uniform(-50, -20),
-            'lifetime': random.uniform(0.3, 0.6),
-            'max_lifetime': 0.6,
-            'alpha': 255,
-            'type': 'movement'
-        })
+        self.particle_emitter.emit(random.uniform(-5, 5), self.height, self.colors['G'],
+                                   random.uniform(-20, 20),
+                                   random.uniform(-50, -20),
+                                   random.uniform(0.3, 0.6),
+                                   size=5, max_lifetime=0.6)
 
     def draw(self, screen, x, y):
         # Aplicar transformaciones
@@ -214,16 +205,8 @@ class PlayerStyle:
         height_diff = scaled_height - self.height
         draw_y -= height_diff
         
-        # Dibujar partículas
-        for particle in self.particles:
-            if particle['type'] == 'attack':
-                color = (*self.colors['W'][:3], particle['alpha'])
-            else:
-                color = (*self.colors['G'][:3], particle['alpha'])
-            
-            pos = (int(draw_x + particle['x']), int(draw_y + particle['y']))
-            size = 3 if particle['type'] == 'attack' else 2
-            pygame.draw.circle(screen, color, pos, size)
+        # Las partículas se dibujan en el pase global, relativas a este origen
+        self.particle_emitter.set_origin(draw_x, draw_y)
         
         # Dibujar sprite principal con manejo seguro de frames
         frames = self.animations[self.current_animation]
@@ -231,81 +214,47 @@ class PlayerStyle:
             return
             
         self.current_frame = self.current_frame % len(frames)  # Ensure valid frame index
-        current_frame = frames[self.current_frame]
         
         # Si hay una transición en curso, mezclar con el frame anterior
         if self.current_blend > 0 and self.previous_animation in self.animations:
             prev_frames = self.animations[self.previous_animation]
             if prev_frames:  # Safety check for previous animation
                 prev_frame_index = min(self.current_frame, len(prev_frames)-1)
-                prev_frame = prev_frames[prev_frame_index]
                 blend_factor = self.current_blend / self.animation_blend_time
-                self._draw_blended_frames(screen, draw_x, draw_y, 
-                                        current_frame, prev_frame, blend_factor)
+                return self._draw_blended_frames(screen, draw_x, draw_y,
+                                                 prev_frame_index, blend_factor)
         else:
-            self._draw_frame(screen, draw_x, draw_y, current_frame)
+            return self._draw_frame(screen, draw_x, draw_y, self.current_animation, self.current_frame)
 
-    def _draw_frame(self, screen, x, y, frame):
-        """Draw a single frame with safe array access"""
-        if not frame:  # Safety check for empty frame
+    def _draw_frame(self, screen, x, y, animation, frame_index):
+        """Dibuja un frame pre-compilado del atlas con un solo blit"""
+        if not self.animations[animation][frame_index]:  # Safety check for empty frame
             return
-            
-        for row_index, row in enumerate(frame):
-            for col_index, pixel in enumerate(row):
-                if pixel in self.colors and self.colors[pixel]:
-                    # Color base
-                    base_color = self.colors[pixel]
-                    
-                    # Añadir brillo dinámico
-                    if pixel in ['X', 'A']:
-                        glow = int(50 * self.glow_intensity)
-                        color = tuple(min(255, c + glow) for c in base_color)
-                    else:
-                        color = base_color
-                    
-                    # Aplicar squash y stretch
-                    pixel_x = x + col_index * self.pixel_size
-                    pixel_y = y + row_index * self.pixel_size * self.squash_stretch
-                    
-                    # Dibujar píxel
-                    pygame.draw.rect(screen, color,
-                                  (pixel_x, pixel_y,
-                                   self.pixel_size,
-                                   self.pixel_size * self.squash_stretch))
 
-    def _draw_blended_frames(self, screen, x, y, current_frame, prev_frame, blend_factor):
-        for row_index, (current_row, prev_row) in enumerate(zip(current_frame, prev_frame)):
-            for col_index, (current_pixel, prev_pixel) in enumerate(zip(current_row, prev_row)):
-                # Obtener colores
-                current_color = self.colors.get(current_pixel)
-                prev_color = self.colors.get(prev_pixel)
-                
-                if current_color or prev_color:
-                    # Si algún color es None, usar negro para la mezcla
-                    current_color = current_color or (0,0,0)
-                    prev_color = prev_color or (0,0,0)
-                    
-                    # Mezclar colores
-                    blended_color = tuple(
-                        int(prev_color[i] * blend_factor + 
-                            current_color[i] * (1 - blend_factor))
-                        for i in range(3)
-                    )
-                    
-                    # Aplicar efectos visuales
-                    if current_pixel in ['X', 'A'] or prev_pixel in ['X', 'A']:
-                        glow = int(50 * self.glow_intensity)
-                        blended_color = tuple(min(255, c + glow) 
-                                           for c in blended_color)
-                    
-                    # Dibujar píxel con squash y stretch
-                    pixel_x = x + col_index * self.pixel_size
-                    pixel_y = y + row_index * self.pixel_size * self.squash_stretch
-                    
-                    pygame.draw.rect(screen, blended_color,
-                                  (pixel_x, pixel_y,
-                                   self.pixel_size,
-                                   self.pixel_size * self.squash_stretch))
+        # Variante cacheada de squash/stretch; brillo y destello van en la paleta
+        surface = self.atlas.get_variant(animation, frame_index, self.facing_right,
+                                         self.squash_stretch)
+        return self.atlas.blit(screen, surface, self._current_palette(), (x, y))
+
+    def _current_palette(self):
+        """Paleta de 8 bits con el brillo dinámico y el destello de golpe"""
+        return build_palette(self.palette_letters, self.colors, self.glow_letters,
+                             int(50 * self.glow_intensity), self.hit_flash)
+
+    def _draw_blended_frames(self, screen, x, y, prev_frame_index, blend_factor):
+        """Dibuja la transición desde la animación anterior con un solo blit.
+
+        La superficie de pares se compila una vez por transición; el paso del
+        blend, el brillo y el destello solo cambian la paleta.
+        """
+        surface, pairs = self.atlas.get_crossfade(
+            self.previous_animation, prev_frame_index,
+            self.current_animation, self.current_frame,
+            self.facing_right, self.squash_stretch)
+        palette = build_crossfade_palette(pairs, self.colors, self.glow_letters,
+                                          int(50 * self.glow_intensity),
+                                          blend_factor, self.hit_flash)
+        return self.atlas.blit(screen, surface, palette, (x, y))
 
     def set_colors(
         self,
@@ -315,9 +264,10 @@ class PlayerStyle:
         """Actualiza los colores del sprite"""
         self.colors['X'] = base_color
         self.colors['A'] = accent_color
-        self.parsed_frames_cache.clear()  # Limpiar cache al cambiar colores
+        # Los frames son indexados: la nueva paleta se aplica en el próximo blit
 
     def resize_pixels(self, new_size: int) -> None:
         """Cambia el tamaño de los píxeles del sprite"""
         self.pixel_size = new_size
-        self.parsed_frames_cache.clear()  # Limpiar cache al cambiar tamaño
\ No newline at end of file
+        self.atlas = get_atlas(type(self).__name__, self.animations,
+                               self.pixel_size, self.palette_letters)
\ No newline at end of file
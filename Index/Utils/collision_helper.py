@@ -1,10 +1,196 @@
 import pygame
-from typing import List, Tuple, Dict, Set
+import numpy as np
+from typing import Iterable, List, Optional, Sequence, Tuple, Dict, Set
+
+# Letras del pixel art que cuentan para la colisión pixel-perfect
+SOLID_LETTERS = ('X', 'A')
+# Distancia máxima (px) entre los pies y una plataforma para seguir apoyado
+SUPPORT_TOLERANCE = 1.0
+
+
+def _cell_shifts(offset: int, cell_size: int) -> Tuple[int, ...]:
+    """Desplazamientos en celdas que puede tener un offset en píxeles.
+
+    Si el offset no cae en el borde de una celda, cada celda toca dos celdas
+    de la otra rejilla.
+    """
+    cells, remainder = divmod(offset, cell_size)
+    return (cells,) if remainder == 0 else (cells, cells + 1)
+
+
+def bitboards_overlap(rows1: Tuple[int, ...], rows2: Tuple[int, ...],
+                      offset: Tuple[int, int], cell_size: int) -> bool:
+    """Comprueba si dos bitboards con el mismo tamaño de celda se solapan.
+
+    `offset` es la posición en píxeles del segundo respecto al primero. El
+    resultado es el mismo que el de las máscaras a resolución de píxel: cada
+    fila se compara con desplazamientos de bits y un AND.
+    """
+    column_shifts = _cell_shifts(offset[0], cell_size)
+    for row_shift in _cell_shifts(offset[1], cell_size):
+        first = max(0, row_shift)
+        last = min(len(rows1), len(rows2) + row_shift)
+        for index in range(first, last):
+            row1 = rows1[index]
+            row2 = rows2[index - row_shift]
+            if not row1 or not row2:
+                continue
+            for shift in column_shifts:
+                shifted = row2 << shift if shift >= 0 else row2 >> -shift
+                if row1 & shifted:
+                    return True
+    return False
+
+def _body_size(body: any) -> Tuple[float, float]:
+    """Tamaño de colisión de un cuerpo: el de su estilo si lo tiene"""
+    size = body.style if hasattr(body, 'style') else body
+    return size.width, size.height
+
+
+def platform_boxes(platforms: Iterable[any]) -> np.ndarray:
+    """Convierte plataformas en una matriz (M, 4) de left, top, right, bottom"""
+    boxes = [(p.rect.left, p.rect.top, p.rect.right, p.rect.bottom) for p in platforms]
+    return np.array(boxes, dtype=float).reshape(-1, 4)
+
+
+def swept_time_of_impact(start: np.ndarray, size: np.ndarray, delta: np.ndarray,
+                         boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Tiempo de impacto de cajas en movimiento contra cajas fijas (AABB barrido).
+
+    `start`, `size` y `delta` son matrices (N, 2): esquina al inicio del paso,
+    tamaño y desplazamiento en el paso. Devuelve dos matrices (N, M): la
+    fracción del paso en [0, 1] en la que cada caja toca cada plataforma (inf
+    si no la toca) y el eje del choque (0 = x, 1 = y). Las cajas que ya se
+    solapan al empezar no cuentan; esas se resuelven por solape.
+    """
+    low, high = boxes[:, :2], boxes[:, 2:]
+    near = start[:, None, :]
+    far = near + size[:, None, :]
+    delta = delta[:, None, :]
+
+    # Slabs: tiempo de entrada y salida en cada eje
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entry = np.where(delta > 0, low - far, high - near) / delta
+        exit_time = np.where(delta > 0, high - near, low - far) / delta
+    # Un eje sin movimiento se solapa durante todo el paso o nunca
+    still = delta == 0
+    overlapping = (near < high) & (far > low)
+    entry = np.where(still, np.where(overlapping, -np.inf, np.inf), entry)
+    exit_time = np.where(still, np.where(overlapping, np.inf, -np.inf), exit_time)
+
+    time = entry.max(axis=2)
+    hit = (time >= 0) & (time <= 1) & (time < exit_time.min(axis=2))
+    return np.where(hit, time, np.inf), entry.argmax(axis=2)
+
+
+def resolve_platform_collisions(bodies: Sequence[any], previous: Sequence[Tuple[float, float]],
+                                boxes: np.ndarray) -> np.ndarray:
+    """Resuelve a la vez las colisiones de varios cuerpos contra las plataformas.
+
+    `previous` es la posición (x, y) de cada cuerpo antes de integrar el paso.
+    Primero se busca el primer choque a lo largo del desplazamiento (AABB
+    barrido), así que un cuerpo rápido no atraviesa una plataforma aunque el
+    paso sea largo. Después, con los solapes que queden, un cuerpo que cae
+    aterriza en la plataforma más alta que tenía por debajo; uno que sube
+    choca con la más baja que tenía por encima; el resto de solapes se
+    empujan por el lado del que venían. Al final `on_ground` indica
+    si el cuerpo quedó apoyado. Todo se calcula con matrices (cuerpos x
+    plataformas) y solo se escriben de vuelta los atributos. Devuelve
+    `on_ground` de cada cuerpo.
+    """
+    count = len(bodies)
+    if count == 0 or len(boxes) == 0:
+        # Sin plataformas cerca nadie está apoyado
+        for body in bodies:
+            body.on_ground = False
+        return np.zeros(count, dtype=bool)
+
+    x, y, width, height, velocity_x, velocity_y = np.array(
+        [(body.x, body.y, *_body_size(body), body.velocity_x, body.velocity_y)
+         for body in bodies], dtype=float).T
+    previous_x, previous_y = np.array(previous, dtype=float).reshape(count, 2).T
+    left, top, right, bottom = boxes.T
+    w, h = width[:, None], height[:, None]
+    landed = np.zeros(count, dtype=bool)
+
+    def overlap_x(x):
+        return (x[:, None] < right) & (x[:, None] + w > left)
+
+    def overlap(x, y):
+        return overlap_x(x) & (y[:, None] < bottom) & (y[:, None] + h > top)
+
+    # Primer choque a lo largo del desplazamiento; solo hace falta si algún
+    # cuerpo avanza en un paso tanto como su tamaño o el grosor de una plataforma
+    delta_x, delta_y = x - previous_x, y - previous_y
+    thinnest = (boxes[:, 2:] - boxes[:, :2]).min(axis=0)
+    fast = ((np.abs(delta_x) >= np.minimum(width, thinnest[0]))
+            | (np.abs(delta_y) >= np.minimum(height, thinnest[1])))
+    if fast.any():
+        time, axis = swept_time_of_impact(np.stack((previous_x, previous_y), axis=1),
+                                          np.stack((width, height), axis=1),
+                                          np.stack((delta_x, delta_y), axis=1), boxes)
+        first = time.argmin(axis=1)
+        rows = np.arange(count)
+        impact = np.isfinite(time[rows, first])
+        vertical = impact & (axis[rows, first] == 1)
+        horizontal = impact & ~vertical
+        landed = vertical & (delta_y > 0)
+        y = np.where(landed, top[first] - height, y)
+        y = np.where(vertical & (delta_y < 0), bottom[first], y)
+        velocity_y = np.where(vertical, 0.0, velocity_y)
+        x = np.where(horizontal & (delta_x > 0), left[first] - width, x)
+        x = np.where(horizontal & (delta_x < 0), right[first], x)
+        velocity_x = np.where(horizontal, 0.0, velocity_x)
+
+    # Los pasos de solape se saltan en el caso habitual (apoyado o en el aire)
+    hits = overlap(x, y)
+    if hits.any():
+        # Vertical, según de dónde venía cada cuerpo
+        landing = hits & (velocity_y >= 0)[:, None] & (previous_y[:, None] + h <= top)
+        ceiling = hits & (velocity_y < 0)[:, None] & (previous_y[:, None] >= bottom)
+        landed_now = landing.any(axis=1)
+        bumped = ceiling.any(axis=1)
+        y = np.where(landed_now, np.where(landing, top, np.inf).min(axis=1) - height, y)
+        y = np.where(bumped, np.where(ceiling, bottom, -np.inf).max(axis=1), y)
+        velocity_y = np.where(landed_now | bumped, 0.0, velocity_y)
+        landed = landed | landed_now
+
+        # Horizontal, con la altura ya resuelta
+        hits = overlap(x, y)
+        if hits.any():
+            from_left = hits & (previous_x[:, None] + w <= left)
+            from_right = hits & (previous_x[:, None] >= right)
+            pushed_left = from_left.any(axis=1)
+            pushed_right = from_right.any(axis=1)
+            x = np.where(pushed_left, np.where(from_left, left, np.inf).min(axis=1) - width, x)
+            x = np.where(pushed_right, np.where(from_right, right, -np.inf).max(axis=1), x)
+            velocity_x = np.where(pushed_left | pushed_right, 0.0, velocity_x)
+
+    # Apoyo: a menos de SUPPORT_TOLERANCE de una plataforma y sin subir
+    support = (overlap_x(x) & (np.abs(y[:, None] + h - top) <= SUPPORT_TOLERANCE)
+               & (velocity_y >= 0)[:, None])
+    supported = support.any(axis=1)
+    y = np.where(supported, np.where(support, top, np.inf).min(axis=1) - height, y)
+    velocity_y = np.where(supported, 0.0, velocity_y)
+    on_ground = landed | supported
+
+    for index, body in enumerate(bodies):
+        body.x = float(x[index])
+        body.y = float(y[index])
+        body.velocity_x = float(velocity_x[index])
+        body.velocity_y = float(velocity_y[index])
+        body.on_ground = bool(on_ground[index])
+        if landed[index]:
+            body.is_jumping = False
+    return on_ground
+
 
 class SpatialGrid:
     def __init__(self, cell_size: int = 64):
         self.cell_size = cell_size
         self.grid: Dict[Tuple[int, int], Set] = {}
+        # Celdas que ocupa cada objeto, para poder moverlo o quitarlo
+        self.object_cells: Dict[any, List[Tuple[int, int]]] = {}
         
     def _get_cell(self, x: float, y: float) -> Tuple[int, int]:
         """Obtiene la celda de la cuadrícula para una posición"""
@@ -28,10 +214,28 @@ class SpatialGrid:
             if cell not in self.grid:
                 self.grid[cell] = set()
             self.grid[cell].add(obj)
+        self.object_cells[obj] = cells
+            
+    def remove_object(self, obj: any) -> None:
+        """Quita un objeto de todas las celdas que ocupa"""
+        for cell in self.object_cells.pop(obj, ()):
+            objects = self.grid[cell]
+            objects.discard(obj)
+            if not objects:
+                del self.grid[cell]
+            
+    def update_object(self, obj: any, rect: pygame.Rect) -> None:
+        """Mueve un objeto; solo toca la cuadrícula si cambian sus celdas"""
+        cells = self._get_overlapping_cells(rect)
+        if self.object_cells.get(obj) == cells:
+            return
+        self.remove_object(obj)
+        self.add_object(obj, rect)
             
     def clear(self) -> None:
         """Limpia la cuadrícula espacial"""
         self.grid.clear()
+        self.object_cells.clear()
         
     def get_nearby_objects(self, rect: pygame.Rect) -> Set:
         """Obtiene objetos cercanos que podrían colisionar"""
@@ -43,53 +247,111 @@ class SpatialGrid:
         return nearby
 
 class CollisionHelper:
-    def __init__(self):
+    """Servicio de colisiones del mundo.
+
+    Vive mientras dura la partida: las plataformas se insertan en la
+    cuadrícula una vez por nivel y las entidades que se mueven se actualizan
+    de forma incremental.
+    """
+    def __init__(self, use_bitboards: bool = True):
         self.spatial_grid = SpatialGrid()
-        self.mask_cache: Dict[str, pygame.mask.Mask] = {}
+        # Colisión a resolución de celda con bitboards cuando ambos estilos lo permiten
+        self.use_bitboards = use_bitboards
+        # Máscaras de estilos sin atlas de sprites
+        self.mask_cache: Dict[tuple, pygame.mask.Mask] = {}
+        # Orden de inserción de los objetos estáticos, para resolver de forma determinista
+        self.static_order: Dict[any, int] = {}
+        # Cajas de los objetos estáticos en ese mismo orden
+        self.static_boxes = np.zeros((0, 4))
         
     @staticmethod
-    def get_pixel_mask(sprite_data: List[str], width: int, height: int, pixel_size: int) -> pygame.mask.Mask:
+    def get_pixel_mask(sprite_data: List[str], width: int, height: int, pixel_size: int,
+                       facing_right: bool = True) -> pygame.mask.Mask:
         """Crear una máscara de colisión desde datos de pixel art"""
         mask_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        columns = max((len(row) for row in sprite_data), default=0)
         for y, row in enumerate(sprite_data):
             for x, pixel in enumerate(row):
-                if pixel in ('X', 'A'):
+                if pixel in SOLID_LETTERS:
+                    if not facing_right:
+                        x = columns - 1 - x
                     pygame.draw.rect(mask_surface, (255, 255, 255, 255),
                                   (x * pixel_size, y * pixel_size, pixel_size, pixel_size))
         return pygame.mask.from_surface(mask_surface)
 
+    def get_entity_mask(self, entity: any) -> pygame.mask.Mask:
+        """Máscara del frame actual de una entidad.
+
+        Se toma del atlas del estilo, con clave (estilo, animación, frame,
+        orientación, tamaño de píxel); los estilos sin atlas usan una caché
+        local con la misma clave.
+        """
+        style = entity.style
+        facing_right = getattr(style, 'facing_right', True)
+        size = (style.width, style.height)
+        atlas = getattr(style, 'atlas', None)
+        if atlas is not None:
+            return atlas.get_mask(style.current_animation, style.current_frame,
+                                  facing_right, SOLID_LETTERS, size)
+
+        pixel_size = getattr(style, 'pixel_size', 10)
+        key = (type(style).__name__, style.current_animation, style.current_frame,
+               facing_right, pixel_size)
+        mask = self.mask_cache.get(key)
+        if mask is None:
+            frame = style.animations[style.current_animation][style.current_frame]
+            mask = self.get_pixel_mask(frame, style.width, style.height, pixel_size, facing_right)
+            self.mask_cache[key] = mask
+        return mask
+
+    def get_entity_bitboard(self, entity: any) -> Optional[Tuple[int, ...]]:
+        """Bitboard del frame actual de una entidad, o None si su estilo no tiene atlas"""
+        style = entity.style
+        atlas = getattr(style, 'atlas', None)
+        if atlas is None:
+            return None
+        return atlas.get_bitboard(style.current_animation, style.current_frame,
+                                  getattr(style, 'facing_right', True), SOLID_LETTERS,
+                                  (style.width, style.height))
+
+    def check_bitboard_collision(self, entity1: any, entity2: any) -> Optional[bool]:
+        """Colisión a resolución de celda entre dos sprites de pixel art.
+
+        Primero descarta por rectángulos; los desplazamientos que no caen en
+        una celda se resuelven comparando con las dos celdas vecinas. Devuelve
+        None si las entidades no tienen bitboards compatibles.
+        """
+        style1, style2 = entity1.style, entity2.style
+        if style1.pixel_size != style2.pixel_size:
+            return None
+        rows1 = self.get_entity_bitboard(entity1)
+        rows2 = self.get_entity_bitboard(entity2)
+        if rows1 is None or rows2 is None:
+            return None
+
+        offset = (
+            int(entity2.x - entity1.x),
+            int(entity2.y - entity1.y)
+        )
+        if (offset[0] >= style1.width or -offset[0] >= style2.width
+                or offset[1] >= style1.height or -offset[1] >= style2.height):
+            return False
+        return bitboards_overlap(rows1, rows2, offset, style1.pixel_size)
+
     def check_pixel_perfect_collision(self, entity1: any, entity2: any) -> bool:
-        """Verificar colisión pixel-perfect entre dos entidades con caché"""
+        """Verificar colisión pixel-perfect entre dos entidades con formas precalculadas"""
         try:
-            # Obtener frames actuales de animación
-            frame1 = entity1.style.animations[entity1.style.current_animation][entity1.style.current_frame]
-            frame2 = entity2.style.animations[entity2.style.current_animation][entity2.style.current_frame]
-            
-            # Obtener tamaños de píxel
-            pixel_size1 = getattr(entity1.style, 'pixel_size', 10)
-            pixel_size2 = getattr(entity2.style, 'pixel_size', 10)
-            
-            # Generar claves únicas para el caché
-            key1 = f"{entity1.style.current_animation}_{entity1.style.current_frame}"
-            key2 = f"{entity2.style.current_animation}_{entity2.style.current_frame}"
-            
-            # Obtener o crear máscaras
-            if key1 not in self.mask_cache:
-                self.mask_cache[key1] = self.get_pixel_mask(
-                    frame1, entity1.style.width, entity1.style.height, pixel_size1)
-            if key2 not in self.mask_cache:
-                self.mask_cache[key2] = self.get_pixel_mask(
-                    frame2, entity2.style.width, entity2.style.height, pixel_size2)
-                
-            mask1 = self.mask_cache[key1]
-            mask2 = self.mask_cache[key2]
-            
-            # Calcular offset
+            if self.use_bitboards:
+                result = self.check_bitboard_collision(entity1, entity2)
+                if result is not None:
+                    return result
+
+            mask1 = self.get_entity_mask(entity1)
+            mask2 = self.get_entity_mask(entity2)
             offset = (
                 int(entity2.x - entity1.x),
                 int(entity2.y - entity1.y)
             )
-            
             return mask1.overlap(mask2, offset) is not None
             
         except (AttributeError, KeyError, IndexError):
@@ -106,20 +368,48 @@ class CollisionHelper:
                 return entity.rect
             # Si no tiene rect, intentar construirlo desde x,y y dimensiones
             elif hasattr(entity, 'x') and hasattr(entity, 'y'):
-                width = getattr(entity.style, 'width', entity.width)
-                height = getattr(entity.style, 'height', entity.height)
+                size = entity.style if hasattr(entity, 'style') else entity
+                width = size.width
+                height = size.height
                 return pygame.Rect(entity.x, entity.y, width, height)
         except AttributeError:
             # Si algo falla, retornar None
             return None
 
     def update_spatial_grid(self, entities: List[any]) -> None:
-        """Actualiza la cuadrícula espacial con las entidades actuales"""
-        self.spatial_grid.clear()
+        """Actualiza en la cuadrícula las entidades que se mueven"""
         for entity in entities:
             rect = self._get_entity_rect(entity)
             if rect is not None:
-                self.spatial_grid.add_object(entity, rect)
+                self.spatial_grid.update_object(entity, rect)
+
+    def set_static_objects(self, objects: List[any]) -> None:
+        """Reinicia la cuadrícula con los objetos estáticos de un nivel"""
+        self.spatial_grid.clear()
+        self.static_order = {obj: index for index, obj in enumerate(objects)}
+        self.static_boxes = platform_boxes(objects)
+        for obj in objects:
+            rect = self._get_entity_rect(obj)
+            if rect is not None:
+                self.spatial_grid.add_object(obj, rect)
+
+    def resolve_platforms(self, bodies: Sequence[any],
+                          previous: Sequence[Tuple[float, float]]) -> np.ndarray:
+        """Resuelve los cuerpos contra las plataformas del mundo en un solo lote.
+
+        La cuadrícula se consulta una vez por cuerpo con el área que barrió en
+        el paso y se resuelve contra la unión de las plataformas cercanas.
+        """
+        nearby = set()
+        for body, (previous_x, previous_y) in zip(bodies, previous):
+            width, height = _body_size(body)
+            rect = pygame.Rect(body.x, body.y, width, height)
+            swept = rect.union(pygame.Rect(previous_x, previous_y, width, height))
+            nearby.update(index for index in map(self.static_order.get,
+                                                 self.spatial_grid.get_nearby_objects(swept))
+                          if index is not None)
+        boxes = self.static_boxes[sorted(nearby)]
+        return resolve_platform_collisions(bodies, previous, boxes)
 
     def get_potential_collisions(self, entity: any) -> Set:
         """Obtiene posibles colisiones usando la cuadrícula espacial"""
@@ -153,6 +443,34 @@ class CollisionHelper:
         min_overlap = min(overlaps, key=lambda x: x[0])
         return min_overlap[1], min_overlap[2]  # Retorna (normal, profundidad)
 
+    def get_time_of_impact(self, entity: any, previous: Tuple[float, float],
+                           platform: any) -> Tuple[float, Tuple[int, int]]:
+        """Tiempo de impacto y normal de una entidad que se movió desde `previous`.
+
+        El tiempo es la fracción del paso en la que toca la plataforma. Si ya
+        se solapaban al empezar, devuelve 0 con la normal de
+        `get_collision_normal`; si no hay choque, (1.0, (0, 0)).
+        """
+        entity_rect = self._get_entity_rect(entity)
+        platform_rect = self._get_entity_rect(platform)
+        if entity_rect is None or platform_rect is None:
+            return 1.0, (0, 0)
+
+        delta = (entity.x - previous[0], entity.y - previous[1])
+        box = np.array([[platform_rect.left, platform_rect.top,
+                         platform_rect.right, platform_rect.bottom]], dtype=float)
+        time, axis = swept_time_of_impact(np.array([previous], dtype=float),
+                                          np.array([entity_rect.size], dtype=float),
+                                          np.array([delta], dtype=float), box)
+        if np.isfinite(time[0, 0]):
+            if axis[0, 0] == 0:
+                return float(time[0, 0]), (-1 if delta[0] > 0 else 1, 0)
+            return float(time[0, 0]), (0, -1 if delta[1] > 0 else 1)
+        if entity_rect.colliderect(platform_rect):
+            normal, _ = self.get_collision_normal(entity, platform)
+            return 0.0, normal
+        return 1.0, (0, 0)
+
     def clear_cache(self) -> None:
         """Limpia el caché de máscaras"""
-        self.mask_cache.clear()
\ No newline at end of file
+        self.mask_cache.clear()
@@ -0,0 +1,80 @@
+import pygame
+from typing import Iterable, List, Optional, Union
+
+RectLike = Union[pygame.Rect, Iterable]
+
+
+class DirtyRectRenderer:
+    """Presenta en pantalla solo las regiones que cambiaron en el frame.
+
+    Los que dibujan marcan sus rectángulos con `mark`; `present` actualiza la
+    unión de los rectángulos de este frame y del anterior (para borrar lo que
+    se movió) con `pygame.display.update`. Antes se fusionan los rectángulos
+    que se solapan o están a menos de `merge_distance` píxeles: muchos
+    sprites pequeños juntos (estrellas con su trail y su resplandor) acaban en
+    pocos rectángulos. Si el área sucia supera `max_coverage` de la pantalla,
+    o siguen quedando demasiados rectángulos, vuelve a un `flip` completo.
+    """
+
+    def __init__(self, enabled: bool = True, max_coverage: float = 0.5, max_rects: int = 256,
+                 merge_distance: int = 4):
+        self.enabled = enabled
+        self.max_coverage = max_coverage
+        self.max_rects = max_rects
+        self.merge_distance = merge_distance
+        self.frame_rects: List[pygame.Rect] = []
+        self.previous_rects: List[pygame.Rect] = []
+        self.full_redraw = True
+
+    def mark(self, rects: Optional[RectLike]) -> None:
+        """Marca como sucio un rectángulo o una colección de rectángulos"""
+        if rects is None:
+            return
+        if isinstance(rects, pygame.Rect):
+            self.frame_rects.append(rects)
+        else:
+            self.frame_rects.extend(pygame.Rect(rect) for rect in rects if rect is not None)
+
+    def mark_full(self) -> None:
+        """Fuerza a presentar la pantalla completa (cambio de estado o de resolución)"""
+        self.full_redraw = True
+
+    def merge(self, rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        """Fusiona los rectángulos que se solapan o están a menos de merge_distance"""
+        margin = self.merge_distance * 2
+        merged: List[pygame.Rect] = []
+        for rect in sorted(rects, key=lambda rect: (rect.x, rect.y)):
+            index = rect.inflate(margin, margin).collidelist(merged)
+            while index != -1:
+                # La unión puede alcanzar a otros ya fusionados
+                rect = rect.union(merged.pop(index))
+                index = rect.inflate(margin, margin).collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def present(self) -> None:
+        """Envía el frame a la pantalla con update(rects) o con un flip completo"""
+        screen = pygame.display.get_surface()
+        if not self.enabled or screen is None:
+            self.frame_rects = []
+            pygame.display.flip()
+            return
+
+        screen_rect = screen.get_rect()
+        frame_rects = [rect.clip(screen_rect) for rect in self.frame_rects]
+        frame_rects = self.merge([rect for rect in frame_rects if rect.width and rect.height])
+        rects = self.merge(frame_rects + self.previous_rects)
+        self.previous_rects = frame_rects
+        self.frame_rects = []
+
+        if self.full_redraw:
+            self.full_redraw = False
+            pygame.display.flip()
+            return
+
+        dirty_area = sum(rect.width * rect.height for rect in rects)
+        if (len(rects) > self.max_rects
+                or dirty_area > screen_rect.width * screen_rect.height * self.max_coverage):
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
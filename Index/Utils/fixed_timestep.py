@@ -0,0 +1,34 @@
+class FixedTimestep:
+    """Acumulador de tiempo para simular a paso fijo con independencia del render.
+
+    `advance` recibe el tiempo real del frame y devuelve cuántos pasos de
+    `step` segundos hay que simular. Si hacen falta más de `max_steps` (un
+    frame muy lento), el tiempo sobrante se descarta para no entrar en una
+    espiral en la que cada frame tarda más que el anterior. `alpha` indica
+    cuánto se ha avanzado hacia el siguiente paso, para interpolar el dibujado.
+    """
+
+    def __init__(self, step: float = 1/60, max_steps: int = 5):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, frame_dt: float) -> int:
+        """Acumula el tiempo del frame y devuelve los pasos a simular"""
+        self.accumulator += frame_dt
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Fracción del paso actual ya transcurrida, en [0, 1)"""
+        return min(self.accumulator / self.step, 1.0)
+
+    def reset(self) -> None:
+        """Descarta el tiempo acumulado (al entrar o volver a la simulación)"""
+        self.accumulator = 0.0
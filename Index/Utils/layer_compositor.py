@@ -0,0 +1,121 @@
+import pygame
+from typing import Callable, Dict, List, Optional
+
+from Index.Utils.render_queue import RenderQueue
+from Index.Utils.sprite_atlas import prepare_surface
+
+# Función de dibujo de una capa: dibuja sobre la superficie y devuelve sus áreas
+LayerDraw = Callable[[pygame.Surface], Optional[List[Optional[pygame.Rect]]]]
+
+
+class Layer:
+    """Capa del compositor.
+
+    Una capa dinámica dibuja directamente en la pantalla cada frame. Una capa
+    cacheada dibuja en su propia superficie solo cuando se invalida (o cada
+    `refresh_interval` segundos si está animada) y el resto de frames se copia
+    con un solo lote de blits de las áreas que ocupa.
+    """
+
+    def __init__(self, name: str, draw: LayerDraw, cached: bool = False,
+                 opaque: bool = False, refresh_interval: Optional[float] = None):
+        self.name = name
+        self.draw = draw
+        self.cached = cached
+        self.opaque = opaque
+        self.refresh_interval = refresh_interval
+        self.surface: Optional[pygame.Surface] = None
+        self.rects: List[pygame.Rect] = []
+        self.dirty = True
+        self.age = 0.0
+
+
+class LayerCompositor:
+    """Compone el frame a partir de capas con nombre, en orden de inserción.
+
+    Con una cola de dibujo, las capas dinámicas dibujan sobre la cola (con el
+    índice de la capa) y las cacheadas envían ahí su copia; al final del frame
+    la cola se vacía en unos pocos lotes de blits y sus áreas son las que
+    cambiaron.
+    """
+
+    def __init__(self, queue: Optional[RenderQueue] = None):
+        self.layers: Dict[str, Layer] = {}
+        self.queue = queue
+
+    def add_layer(self, name: str, draw: LayerDraw, cached: bool = False,
+                  opaque: bool = False, refresh_interval: Optional[float] = None) -> Layer:
+        """Añade una capa encima de las existentes"""
+        layer = Layer(name, draw, cached, opaque, refresh_interval)
+        self.layers[name] = layer
+        return layer
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Fuerza a redibujar una capa cacheada (o todas) en el próximo frame"""
+        layers = self.layers.values() if name is None else (self.layers[name],)
+        for layer in layers:
+            layer.dirty = True
+
+    def draw(self, screen: pygame.Surface, dt: float = 0.0) -> List[pygame.Rect]:
+        """Compone todas las capas sobre la pantalla y devuelve las áreas que cambiaron"""
+        changed = []
+        target = screen
+        if self.queue is not None:
+            self.queue.size = screen.get_size()
+            target = self.queue
+        for index, layer in enumerate(self.layers.values()):
+            if self.queue is not None:
+                self.queue.layer = index
+            if not layer.cached:
+                rects = layer.draw(target)
+                if self.queue is None:
+                    changed += [rect for rect in rects or () if rect is not None]
+                continue
+
+            layer.age += dt
+            if layer.surface is None or layer.surface.get_size() != screen.get_size():
+                layer.surface = self._new_layer_surface(screen.get_size(), layer.opaque)
+                layer.rects = [layer.surface.get_rect()]
+                layer.dirty = True
+            if layer.refresh_interval is not None and layer.age >= layer.refresh_interval:
+                layer.dirty = True
+            if layer.dirty:
+                changed += self._redraw(layer)
+
+            # La copia de una capa cacheada no es un cambio: sus áreas ya se
+            # devolvieron al redibujarla
+            if self.queue is not None and layer.opaque:
+                self.queue.submit(layer.surface, (0, 0), track=False)
+            elif self.queue is not None:
+                self.queue.blits([(layer.surface, rect.topleft, rect) for rect in layer.rects],
+                                 doreturn=False, track=False)
+            elif layer.opaque:
+                target.blit(layer.surface, (0, 0))
+            else:
+                target.blits([(layer.surface, rect.topleft, rect) for rect in layer.rects],
+                             doreturn=False)
+        if self.queue is not None:
+            changed += self.queue.flush(screen)
+        return changed
+
+    def _redraw(self, layer: Layer) -> List[pygame.Rect]:
+        """Vuelve a dibujar una capa cacheada y devuelve sus áreas antiguas y nuevas"""
+        old_rects = layer.rects
+        if not layer.opaque:
+            for rect in old_rects:
+                layer.surface.fill((0, 0, 0, 0), rect)
+        bounds = layer.surface.get_rect()
+        rects = [rect.clip(bounds) for rect in layer.draw(layer.surface) or () if rect is not None]
+        layer.rects = [rect for rect in rects if rect.width and rect.height]
+        layer.dirty = False
+        layer.age = 0.0
+        return old_rects + layer.rects
+
+    def _new_layer_surface(self, size, opaque: bool) -> pygame.Surface:
+        """Superficie de una capa: opaca para el fondo, con alpha para el resto"""
+        if opaque:
+            surface = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            return surface
+        return prepare_surface(pygame.Surface(size, pygame.SRCALPHA))
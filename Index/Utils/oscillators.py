@@ -0,0 +1,70 @@
+import math
+import numpy as np
+from typing import Dict, Iterable, Optional, Tuple
+
+TWO_PI = math.pi * 2
+
+
+class OscillatorBank:
+    """Reloj de animación global con un banco de osciladores sin(frecuencia·t + fase).
+
+    Los componentes registran sus osciladores una vez y reciben un handle;
+    `tick` evalúa todos los osciladores con una sola llamada vectorizada por
+    frame y los componentes leen el valor por handle. Dos registros con la
+    misma frecuencia y fase comparten handle.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.time = 0.0
+        self.count = 0
+        self.frequency = np.zeros(capacity)
+        self.phase = np.zeros(capacity)
+        self.values = np.zeros(capacity)
+        self.handles: Dict[Tuple[float, float], int] = {}
+
+    def register(self, frequency: float, phase: float = 0.0) -> int:
+        """Obtiene el handle del oscilador sin(frequency·t + phase)"""
+        phase = phase % TWO_PI
+        key = (round(frequency, 9), round(phase, 9))
+        handle = self.handles.get(key)
+        if handle is not None:
+            return handle
+
+        handle = self.count
+        if handle >= len(self.frequency):
+            capacity = len(self.frequency) * 2
+            self.frequency = np.resize(self.frequency, capacity)
+            self.phase = np.resize(self.phase, capacity)
+            self.values = np.resize(self.values, capacity)
+        self.frequency[handle] = frequency
+        self.phase[handle] = phase
+        self.values[handle] = math.sin(frequency * self.time + phase)
+        self.count += 1
+        self.handles[key] = handle
+        return handle
+
+    def register_many(self, frequency: float, phases: Iterable[float]) -> np.ndarray:
+        """Registra varios osciladores de la misma frecuencia; devuelve sus handles"""
+        return np.array([self.register(frequency, phase) for phase in phases], dtype=np.int64)
+
+    def tick(self, dt: float) -> None:
+        """Avanza el reloj y evalúa todos los osciladores a la vez"""
+        self.time += dt
+        n = self.count
+        np.sin(self.frequency[:n] * self.time + self.phase[:n], out=self.values[:n])
+
+    def value(self, handle: int) -> float:
+        """Valor actual de un oscilador, en [-1, 1]"""
+        return float(self.values[handle])
+
+
+# Reloj compartido por todas las animaciones del juego
+_oscillator_bank: Optional[OscillatorBank] = None
+
+
+def get_oscillator_bank() -> OscillatorBank:
+    """Obtiene el banco de osciladores global"""
+    global _oscillator_bank
+    if _oscillator_bank is None:
+        _oscillator_bank = OscillatorBank()
+    return _oscillator_bank
@@ -0,0 +1,234 @@
+import pygame
+import weakref
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from Index.Utils.sprite_atlas import prepare_surface
+
+
+class ParticleEmitter:
+    """Emisor asociado a una entidad dentro del motor de partículas compartido.
+
+    Las partículas se guardan relativas al origen del emisor, que la entidad
+    actualiza al moverse. Cuando el emisor se destruye (junto con su entidad)
+    sus partículas se descartan y su índice se reutiliza.
+    """
+
+    def __init__(self, engine: "ParticleSystem", gravity: float = 0.0, y_up: bool = False):
+        self.engine = engine
+        self.id = engine._register_emitter(gravity, y_up)
+        weakref.finalize(self, engine._release_emitter, self.id)
+
+    def set_origin(self, x: float, y: float) -> None:
+        """Mueve el origen sobre el que se dibujan las partículas del emisor"""
+        self.engine.origin_x[self.id] = x
+        self.engine.origin_y[self.id] = y
+
+    def emit(self, x, y, color: tuple, velocity_x, velocity_y, lifetime,
+             size=5, max_lifetime=None) -> None:
+        """Añade partículas de este emisor (escalares o arrays)"""
+        self.engine.add_particles(x, y, color, velocity_x, velocity_y, lifetime,
+                                  size, max_lifetime, self.id)
+
+
+class ParticleSystem:
+    """Motor de partículas sobre arrays de NumPy pre-reservados.
+
+    Cada propiedad vive en su propio array (estructura de arrays); la
+    integración es vectorizada, las partículas muertas se eliminan por
+    intercambio con las vivas del final y el dibujado usa sprites cacheados
+    por (tamaño, color, nivel de alpha) enviados en lote con Surface.blits.
+    Todas las partículas del juego comparten este presupuesto: las entidades
+    registran emisores en lugar de mantener sus propias listas.
+    """
+    ALPHA_LEVELS = 16
+    MAX_SIZE = 64
+    GRAVITY = 500
+
+    def __init__(self, max_particles: int = 20000):
+        self.max_particles = max_particles
+        self.count = 0
+        self.x = np.zeros(max_particles)
+        self.y = np.zeros(max_particles)
+        self.vx = np.zeros(max_particles)
+        self.vy = np.zeros(max_particles)
+        self.lifetime = np.zeros(max_particles)
+        self.max_lifetime = np.ones(max_particles)
+        self.size = np.zeros(max_particles, dtype=np.int64)
+        self.color_id = np.zeros(max_particles, dtype=np.int64)
+        self.emitter_id = np.zeros(max_particles, dtype=np.int64)
+        self._arrays = (self.x, self.y, self.vx, self.vy, self.lifetime,
+                        self.max_lifetime, self.size, self.color_id, self.emitter_id)
+
+        # Propiedades por emisor, indexadas por emitter_id
+        self.origin_x = np.zeros(8)
+        self.origin_y = np.zeros(8)
+        self.gravity = np.zeros(8)
+        self.y_up = np.zeros(8, dtype=bool)
+        self.emitter_count = 0
+        self.free_emitters: List[int] = []
+
+        self.colors: List[Tuple[int, int, int]] = []
+        self.color_ids: Dict[Tuple[int, int, int], int] = {}
+        self.particle_surfaces: Dict[int, pygame.Surface] = {}
+
+        # Emisor del mundo: coordenadas con el eje Y hacia arriba y gravedad
+        self.world_emitter = self.create_emitter(gravity=-self.GRAVITY, y_up=True)
+
+    def create_emitter(self, gravity: float = 0.0, y_up: bool = False) -> ParticleEmitter:
+        """Crea un emisor para una entidad"""
+        return ParticleEmitter(self, gravity, y_up)
+
+    def _register_emitter(self, gravity: float, y_up: bool) -> int:
+        """Reserva un índice de emisor, ampliando los arrays si hace falta"""
+        if self.free_emitters:
+            emitter_id = self.free_emitters.pop()
+        else:
+            emitter_id = self.emitter_count
+            self.emitter_count += 1
+            if emitter_id >= len(self.origin_x):
+                capacity = len(self.origin_x) * 2
+                self.origin_x = np.resize(self.origin_x, capacity)
+                self.origin_y = np.resize(self.origin_y, capacity)
+                self.gravity = np.resize(self.gravity, capacity)
+                self.y_up = np.resize(self.y_up, capacity)
+        self.origin_x[emitter_id] = 0
+        self.origin_y[emitter_id] = 0
+        self.gravity[emitter_id] = gravity
+        self.y_up[emitter_id] = y_up
+        return emitter_id
+
+    def _release_emitter(self, emitter_id: int) -> None:
+        """Libera un emisor y descarta sus partículas en la próxima actualización"""
+        n = self.count
+        self.lifetime[:n][self.emitter_id[:n] == emitter_id] = 0
+        self.free_emitters.append(emitter_id)
+
+    def _get_color_id(self, color: tuple) -> int:
+        """Obtiene el índice de un color en la tabla de colores del motor"""
+        color = tuple(color[:3])
+        color_id = self.color_ids.get(color)
+        if color_id is None:
+            color_id = len(self.colors)
+            self.colors.append(color)
+            self.color_ids[color] = color_id
+        return color_id
+
+    def _get_particle_surface(self, key: int) -> pygame.Surface:
+        """Obtiene o crea el sprite de una clave (color, tamaño, nivel de alpha)"""
+        surface = self.particle_surfaces.get(key)
+        if surface is None:
+            color_size, alpha_level = divmod(key, self.ALPHA_LEVELS)
+            color_id, size = divmod(color_size, self.MAX_SIZE)
+            surface = pygame.Surface((max(1, size), max(1, size)), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (*self.colors[color_id], 255),
+                               (size//2, size//2), size//2)
+            surface = prepare_surface(surface)
+            surface.set_alpha(int(255 * alpha_level / (self.ALPHA_LEVELS - 1)))
+            self.particle_surfaces[key] = surface
+        return surface
+
+    def add_particles(self, x, y, color: tuple, velocity_x, velocity_y,
+                      lifetime, size, max_lifetime=None,
+                      emitter_id: Optional[int] = None) -> None:
+        """Añade un lote de partículas de un mismo color (escalares o arrays).
+
+        Sin emisor, las partículas pertenecen al emisor del mundo.
+        """
+        amount = max(np.size(x), np.size(velocity_x), np.size(lifetime), np.size(size))
+        amount = min(amount, self.max_particles - self.count)
+        if amount <= 0:
+            return
+
+        start, end = self.count, self.count + amount
+        for array, values in ((self.x, x), (self.y, y),
+                              (self.vx, velocity_x), (self.vy, velocity_y),
+                              (self.lifetime, lifetime), (self.size, size)):
+            array[start:end] = values[:amount] if np.ndim(values) else values
+        if max_lifetime is None:
+            self.max_lifetime[start:end] = self.lifetime[start:end]
+        else:
+            self.max_lifetime[start:end] = max_lifetime
+        self.size[start:end] = np.clip(self.size[start:end], 1, self.MAX_SIZE - 1)
+        self.color_id[start:end] = self._get_color_id(color)
+        self.emitter_id[start:end] = self.world_emitter.id if emitter_id is None else emitter_id
+        self.count = end
+
+    def add_particle(self, x: float, y: float, color: tuple, velocity_x: float,
+                     velocity_y: float, lifetime: float = 1.0, size: int = 5):
+        """Añade una nueva partícula si no se excede el límite"""
+        self.add_particles(x, y, color, velocity_x, velocity_y, lifetime, size)
+
+    def update(self, dt: float) -> None:
+        """Integra todas las partículas vivas de todos los emisores y compacta las muertas"""
+        n = self.count
+        if not n:
+            return
+
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        self.vy[:n] += self.gravity[self.emitter_id[:n]] * dt  # Gravedad del emisor
+        self.lifetime[:n] -= dt
+
+        # Eliminación por intercambio: los huecos del principio se rellenan con
+        # las partículas vivas del final, sin mover el resto
+        alive = self.lifetime[:n] > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count != n:
+            holes = np.flatnonzero(~alive[:alive_count])
+            movers = np.flatnonzero(alive[alive_count:]) + alive_count
+            for array in self._arrays:
+                array[holes] = array[movers]
+            self.count = alive_count
+
+    def draw(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """Dibuja todas las partículas de todos los emisores en un solo lote de blits.
+
+        Devuelve las áreas dibujadas para el renderizado por regiones sucias.
+        """
+        n = self.count
+        if not n:
+            return []
+
+        # Calcular alpha basado en tiempo de vida, cuantizado a ALPHA_LEVELS
+        alpha_level = (self.lifetime[:n] / self.max_lifetime[:n] * (self.ALPHA_LEVELS - 1))
+        alpha_level = np.clip(np.rint(alpha_level), 0, self.ALPHA_LEVELS - 1).astype(np.int64)
+        visible = np.flatnonzero(alpha_level > 0)
+        if not len(visible):
+            return []
+
+        size = self.size[visible]
+        keys = ((self.color_id[visible] * self.MAX_SIZE + size) * self.ALPHA_LEVELS
+                + alpha_level[visible]).tolist()
+        # Posición relativa al origen del emisor; el emisor del mundo usa Y hacia arriba
+        emitters = self.emitter_id[visible]
+        half = size // 2
+        xs = (self.x[visible] + self.origin_x[emitters] - half).tolist()
+        ys = self.y[visible] + self.origin_y[emitters]
+        ys = (np.where(self.y_up[emitters], screen.get_height() - ys, ys) - half).tolist()
+
+        surfaces = self.particle_surfaces
+        return screen.blits([(surfaces.get(key) or self._get_particle_surface(key), position)
+                             for key, position in zip(keys, zip(xs, ys))])
+
+    def create_explosion(self, x: float, y: float, color: tuple,
+                         num_particles: int = 20, spread: float = 200):
+        """Crea una explosión de partículas con efecto mejorado"""
+        angle = np.random.uniform(0, np.pi * 2, num_particles)
+        speed = np.random.uniform(100, spread, num_particles)
+        lifetime = np.random.uniform(0.5, 1.5, num_particles)
+        size = np.random.randint(3, 8, num_particles)
+        self.add_particles(x, y, color, np.cos(angle) * speed, np.sin(angle) * speed,
+                           lifetime, size)
+
+
+# Motor compartido por todas las entidades del juego
+_particle_system: Optional[ParticleSystem] = None
+
+
+def get_particle_system() -> ParticleSystem:
+    """Obtiene el motor de partículas global"""
+    global _particle_system
+    if _particle_system is None:
+        _particle_system = ParticleSystem()
+    return _particle_system
@@ -0,0 +1,101 @@
+import pygame
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Color = Tuple[int, int, int]
+
+
+class RenderQueue:
+    """Cola de comandos de dibujo del frame que se vacía en lotes de Surface.blits.
+
+    Se comporta como una superficie de destino para quien dibuja con `blit` o
+    `blits`: en lugar de dibujar, registra los comandos con la capa actual.
+    `flush` los ordena por capa, manteniendo el orden de envío dentro de cada
+    una, y los dibuja con el menor número posible de llamadas a `blits`. Solo
+    se corta un lote cuando una superficie indexada necesita otra paleta.
+    Las áreas dibujadas se obtienen del propio `flush`, salvo las de los
+    comandos enviados con `track=False` (copias de capas que no cambiaron).
+    """
+
+    def __init__(self, size: Tuple[int, int] = (0, 0)):
+        self.size = size
+        self.layer = 0
+        self.commands: List[tuple] = []
+        # Estadísticas del último flush
+        self.draw_calls = 0
+        self.sprite_count = 0
+
+    # Interfaz de superficie para el código de dibujo existente
+    def get_size(self) -> Tuple[int, int]:
+        return self.size
+
+    def get_width(self) -> int:
+        return self.size[0]
+
+    def get_height(self) -> int:
+        return self.size[1]
+
+    def get_rect(self) -> pygame.Rect:
+        return pygame.Rect((0, 0), self.size)
+
+    def blit(self, source: pygame.Surface, dest, area=None) -> pygame.Rect:
+        """Registra un blit en la capa actual"""
+        return self.submit(source, dest, area=area)
+
+    def blits(self, blit_sequence, doreturn: bool = True,
+              track: bool = True) -> Optional[List[pygame.Rect]]:
+        """Registra un lote de blits (source, dest[, area]) en la capa actual.
+
+        Las áreas no se calculan aquí (la lista devuelta está vacía): las
+        devuelve `flush` para todo el frame.
+        """
+        self.commands.append((self.layer, list(blit_sequence), None, track))
+        return [] if doreturn else None
+
+    def submit(self, source: pygame.Surface, dest, layer: Optional[int] = None,
+               area=None, palette: Optional[Sequence[Color]] = None,
+               track: bool = True) -> pygame.Rect:
+        """Añade un comando de dibujo y devuelve el área de pantalla que ocupará"""
+        layer = self.layer if layer is None else layer
+        item = (source, dest, area) if area is not None else (source, dest)
+        self.commands.append((layer, [item], palette, track))
+        size = pygame.Rect(area).size if area is not None else source.get_size()
+        return pygame.Rect((int(dest[0]), int(dest[1])), size).clip(self.get_rect())
+
+    def flush(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """Dibuja todos los comandos pendientes en lotes, vacía la cola y
+        devuelve las áreas dibujadas"""
+        # sort es estable: dentro de una capa se respeta el orden de envío
+        self.commands.sort(key=lambda command: command[0])
+        self.draw_calls = 0
+        self.sprite_count = 0
+
+        rects = []
+        batch = []
+        tracked = []
+        palettes: Dict[pygame.Surface, Sequence[Color]] = {}
+        for _, items, palette, track in self.commands:
+            if palette is not None:
+                # Una superficie indexada solo tiene una paleta por lote
+                source = items[0][0]
+                if source in palettes and palettes[source] != palette:
+                    rects += self._blit_batch(screen, batch, tracked, palettes)
+                    batch, tracked, palettes = [], [], {}
+                palettes[source] = palette
+            batch += items
+            tracked += [track] * len(items)
+        rects += self._blit_batch(screen, batch, tracked, palettes)
+        self.commands.clear()
+        return rects
+
+    def _blit_batch(self, screen: pygame.Surface, batch: list, tracked: List[bool],
+                    palettes: Dict[pygame.Surface, Sequence[Color]]) -> List[pygame.Rect]:
+        if not batch:
+            return []
+        for surface, palette in palettes.items():
+            surface.set_palette(palette)
+        self.draw_calls += 1
+        self.sprite_count += len(batch)
+        rects = screen.blits(batch)
+        if all(tracked):
+            return rects
+        return [rect for rect, track in zip(rects, tracked) if track]
@@ -0,0 +1,84 @@
+import math
+import pygame
+from typing import Iterable, List, Optional, Tuple
+
+# Resolución lógica en la que se simula y dibuja el juego
+LOGICAL_SIZE = (800, 450)
+LETTERBOX_COLOR = (0, 0, 0)
+
+
+class RenderTarget:
+    """Superficie lógica de tamaño fijo que se presenta con un único escalado.
+
+    El juego se dibuja siempre a LOGICAL_SIZE y `present` lo escala una vez por
+    frame al viewport de la ventana, manteniendo la proporción (con bandas
+    negras si hace falta). Con `integer_scale` el factor se redondea hacia abajo
+    a un entero para conservar los píxeles nítidos. Si la ventana ya tiene el
+    tamaño lógico se dibuja directamente en ella, sin pase extra.
+    """
+
+    def __init__(self, logical_size: Tuple[int, int] = LOGICAL_SIZE, integer_scale: bool = False):
+        self.logical_size = logical_size
+        self.integer_scale = integer_scale
+        self.surface: Optional[pygame.Surface] = None
+
+    def get_surface(self, window: pygame.Surface) -> pygame.Surface:
+        """Superficie en la que dibujar el frame lógico"""
+        if window.get_size() == self.logical_size:
+            return window
+        if self.surface is None or self.surface.get_bitsize() != window.get_bitsize():
+            # Mismo formato que la ventana para que el escalado no convierta píxeles
+            self.surface = pygame.Surface(self.logical_size, 0, window)
+        return self.surface
+
+    def viewport(self, window_size: Tuple[int, int]) -> pygame.Rect:
+        """Área de la ventana que ocupa el frame escalado"""
+        width, height = self.logical_size
+        scale = min(window_size[0] / width, window_size[1] / height)
+        if self.integer_scale:
+            scale = max(1, math.floor(scale))
+        rect = pygame.Rect(0, 0, round(width * scale), round(height * scale))
+        rect.center = (window_size[0] // 2, window_size[1] // 2)
+        return rect
+
+    def present(self, window: pygame.Surface,
+                rects: Optional[Iterable[Optional[pygame.Rect]]] = None) -> List[pygame.Rect]:
+        """Escala el frame lógico a la ventana y traduce las áreas sucias.
+
+        Devuelve las áreas en coordenadas de ventana; sin `rects`, el viewport
+        completo.
+        """
+        if window.get_size() == self.logical_size:
+            return [rect for rect in rects or () if rect is not None]
+
+        viewport = self.viewport(window.get_size())
+        window_rect = window.get_rect()
+        # Bandas laterales/superiores fuera del viewport
+        if viewport.width < window_rect.width:
+            window.fill(LETTERBOX_COLOR, (0, 0, viewport.left, window_rect.height))
+            window.fill(LETTERBOX_COLOR, (viewport.right, 0,
+                                          window_rect.width - viewport.right, window_rect.height))
+        if viewport.height < window_rect.height:
+            window.fill(LETTERBOX_COLOR, (0, 0, window_rect.width, viewport.top))
+            window.fill(LETTERBOX_COLOR, (0, viewport.bottom,
+                                          window_rect.width, window_rect.height - viewport.bottom))
+
+        if viewport.size == self.logical_size:
+            window.blit(self.surface, viewport)
+        else:
+            pygame.transform.scale(self.surface, viewport.size, window.subsurface(viewport))
+
+        if rects is None:
+            return [viewport]
+        scale_x = viewport.width / self.logical_size[0]
+        scale_y = viewport.height / self.logical_size[1]
+        scaled = []
+        for rect in rects:
+            if rect is None:
+                continue
+            left = viewport.x + math.floor(rect.left * scale_x)
+            top = viewport.y + math.floor(rect.top * scale_y)
+            right = viewport.x + math.ceil(rect.right * scale_x)
+            bottom = viewport.y + math.ceil(rect.bottom * scale_y)
+            scaled.append(pygame.Rect(left, top, right - left, bottom - top).clip(viewport))
+        return scaled
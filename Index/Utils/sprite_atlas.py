@@ -0,0 +1,304 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from Index.Utils.render_queue import RenderQueue
+
+Color = Tuple[int, int, int]
+
+# Índice de paleta reservado para los píxeles transparentes
+TRANSPARENT_INDEX = 0
+# Variantes escaladas que se mantienen vivas en el LRU de cada atlas
+MAX_VARIANTS = 256
+
+
+def prepare_surface(surface: pygame.Surface) -> pygame.Surface:
+    """Convierte la superficie al formato de la pantalla si ya existe un display"""
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+
+def build_palette(letters: Sequence[str], colors: Dict[str, Optional[Color]],
+                  glow_letters: Iterable[str] = (), glow: int = 0,
+                  flash: float = 0.0) -> List[Color]:
+    """Construye la paleta de 8 bits de un estilo con brillo y destello aplicados.
+
+    El índice de cada letra es su posición en `letters` más uno; el índice 0 es
+    el color transparente.
+    """
+    palette = [(0, 0, 0)]
+    for letter in letters:
+        color = colors.get(letter) or (0, 0, 0)
+        if glow and letter in glow_letters:
+            color = tuple(min(255, c + glow) for c in color)
+        if flash > 0:
+            color = tuple(int(c + (255 - c) * flash) for c in color)
+        palette.append(color)
+    return palette
+
+
+def build_crossfade_palette(pairs: Sequence[Tuple[str, str]],
+                            colors: Dict[str, Optional[Color]],
+                            glow_letters: Iterable[str] = (), glow: int = 0,
+                            blend_factor: float = 0.0, flash: float = 0.0) -> List[Color]:
+    """Paleta de una transición: mezcla cada par (anterior, actual) según el blend.
+
+    Las letras sin color se mezclan como negro, igual que el dibujado original.
+    """
+    palette = [(0, 0, 0)]
+    for prev_pixel, current_pixel in pairs:
+        prev_color = colors.get(prev_pixel) or (0, 0, 0)
+        current_color = colors.get(current_pixel) or (0, 0, 0)
+        color = tuple(int(prev_color[i] * blend_factor + current_color[i] * (1 - blend_factor))
+                      for i in range(3))
+        if glow and (prev_pixel in glow_letters or current_pixel in glow_letters):
+            color = tuple(min(255, c + glow) for c in color)
+        if flash > 0:
+            color = tuple(int(c + (255 - c) * flash) for c in color)
+        palette.append(color)
+    return palette
+
+
+class SpriteAtlas:
+    """Compila los frames ASCII de un estilo a superficies de 8 bits indexadas.
+
+    Cada frame se compila una sola vez por orientación; el color final se elige
+    en el momento del blit con `set_palette`, así que cambiar colores, brillo o
+    destello no invalida nada.
+    """
+
+    def __init__(self, animations: Dict[str, List[List[str]]], pixel_size: int,
+                 letters: Sequence[str]):
+        self.animations = animations
+        self.pixel_size = pixel_size
+        self.letters = tuple(letters)
+        self.letter_indices = {letter: i + 1 for i, letter in enumerate(self.letters)}
+        self.frames: Dict[tuple, pygame.Surface] = {}
+        self.crossfades: Dict[tuple, Tuple[pygame.Surface, List[Tuple[str, str]]]] = {}
+        self.variants: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.max_variants = MAX_VARIANTS
+        self.masks: Dict[tuple, pygame.mask.Mask] = {}
+        self.bitboards: Dict[tuple, Tuple[int, ...]] = {}
+
+    def frame_size(self, animation: str, frame_index: int) -> Tuple[int, int]:
+        """Tamaño en píxeles de un frame (las filas pueden tener longitudes distintas)"""
+        frame = self.animations[animation][frame_index]
+        columns = max((len(row) for row in frame), default=0)
+        return columns * self.pixel_size, len(frame) * self.pixel_size
+
+    def get_frame(self, animation: str, frame_index: int,
+                  facing_right: bool = True) -> pygame.Surface:
+        """Obtiene el frame compilado para (animación, frame, orientación)"""
+        key = (animation, frame_index, facing_right)
+        surface = self.frames.get(key)
+        if surface is None:
+            surface = self._compile_frame(animation, frame_index, facing_right)
+            self.frames[key] = surface
+        return surface
+
+    def get_variant(self, animation: str, frame_index: int, facing_right: bool = True,
+                    scale_y: float = 1.0) -> pygame.Surface:
+        """Obtiene el frame con squash/stretch vertical desde un LRU de variantes.
+
+        La escala se cuantiza a la altura final en píxeles, que es lo único que
+        distingue visualmente dos variantes.
+        """
+        base = self.get_frame(animation, frame_index, facing_right)
+        return self._scaled(base, (animation, frame_index, facing_right), scale_y)
+
+    def get_crossfade(self, from_animation: str, from_frame: int, to_animation: str,
+                      to_frame: int, facing_right: bool = True,
+                      scale_y: float = 1.0) -> Tuple[pygame.Surface, List[Tuple[str, str]]]:
+        """Obtiene el frame de transición entre dos frames y su lista de pares.
+
+        Cada píxel guarda el índice del par (letra anterior, letra actual), de modo
+        que cualquier paso del blend es solo una paleta distinta sobre la misma
+        superficie.
+        """
+        key = ('crossfade', from_animation, from_frame, to_animation, to_frame, facing_right)
+        entry = self.crossfades.get(key)
+        if entry is None:
+            entry = self._compile_crossfade(from_animation, from_frame,
+                                            to_animation, to_frame, facing_right)
+            self.crossfades[key] = entry
+        base, pairs = entry
+        return self._scaled(base, key, scale_y), pairs
+
+    def _compile_crossfade(self, from_animation: str, from_frame: int, to_animation: str,
+                           to_frame: int, facing_right: bool):
+        """Compila la superficie de pares para una transición concreta"""
+        prev_frame = self.animations[from_animation][from_frame]
+        current_frame = self.animations[to_animation][to_frame]
+        width, height = self.frame_size(to_animation, to_frame)
+        surface = self._new_indexed_surface((width, height))
+        pair_indices: Dict[Tuple[str, str], int] = {}
+
+        for row_index, (current_row, prev_row) in enumerate(zip(current_frame, prev_frame)):
+            for col_index, (current_pixel, prev_pixel) in enumerate(zip(current_row, prev_row)):
+                if current_pixel not in self.letter_indices and prev_pixel not in self.letter_indices:
+                    continue
+                pair = (prev_pixel, current_pixel)
+                index = pair_indices.setdefault(pair, len(pair_indices) + 1)
+                surface.fill(index, (col_index * self.pixel_size,
+                                     row_index * self.pixel_size,
+                                     self.pixel_size, self.pixel_size))
+
+        if not facing_right:
+            surface = pygame.transform.flip(surface, True, False)
+        pairs = sorted(pair_indices, key=pair_indices.get)
+        return surface, pairs
+
+    def _scaled(self, base: pygame.Surface, key: tuple, scale_y: float) -> pygame.Surface:
+        """Escala una superficie base en vertical pasando por el LRU de variantes"""
+        width, height = base.get_size()
+        scaled_height = max(1, round(height * scale_y))
+        if scaled_height == height:
+            return base
+
+        key = key + (scaled_height,)
+        surface = self.variants.get(key)
+        if surface is not None:
+            self.variants.move_to_end(key)
+            return surface
+
+        # transform.scale conserva la profundidad de 8 bits y el colorkey
+        surface = pygame.transform.scale(base, (width, scaled_height))
+        self.variants[key] = surface
+        if len(self.variants) > self.max_variants:
+            self.variants.popitem(last=False)
+        return surface
+
+    def get_mask(self, animation: str, frame_index: int, facing_right: bool = True,
+                 solid_letters: Iterable[str] = ('X', 'A'),
+                 size: Optional[Tuple[int, int]] = None) -> pygame.mask.Mask:
+        """Obtiene la máscara de colisión de un frame.
+
+        Solo cuentan las letras de `solid_letters`; la máscara se recorta a
+        `size` desde la esquina superior izquierda del frame ya orientado. Como
+        el atlas es único por estilo y tamaño de píxel, cada máscara se
+        construye una sola vez.
+        """
+        solid_letters = tuple(solid_letters)
+        key = (animation, frame_index, facing_right, solid_letters, size)
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = self._build_mask(animation, frame_index, facing_right, solid_letters, size)
+            self.masks[key] = mask
+        return mask
+
+    def _build_mask(self, animation: str, frame_index: int, facing_right: bool,
+                    solid_letters: Tuple[str, ...],
+                    size: Optional[Tuple[int, int]]) -> pygame.mask.Mask:
+        """Rellena la máscara celda a celda, reflejando las columnas si mira a la izquierda"""
+        frame = self.animations[animation][frame_index]
+        frame_width, frame_height = self.frame_size(animation, frame_index)
+        mask = pygame.mask.Mask(size or (max(1, frame_width), max(1, frame_height)))
+        cell = pygame.mask.Mask((self.pixel_size, self.pixel_size), fill=True)
+        columns = frame_width // self.pixel_size
+
+        for row_index, row in enumerate(frame):
+            for col_index, pixel in enumerate(row):
+                if pixel in solid_letters:
+                    column = col_index if facing_right else columns - 1 - col_index
+                    mask.draw(cell, (column * self.pixel_size, row_index * self.pixel_size))
+        return mask
+
+    def get_bitboard(self, animation: str, frame_index: int, facing_right: bool = True,
+                     solid_letters: Iterable[str] = ('X', 'A'),
+                     size: Optional[Tuple[int, int]] = None) -> Tuple[int, ...]:
+        """Obtiene el frame como bitboard: un entero por fila, un bit por celda.
+
+        El bit `c` de cada fila indica si la celda de la columna `c` es sólida
+        (ya orientada). Con `size` solo se conservan las celdas que empiezan
+        dentro de ese área, igual que la máscara recortada.
+        """
+        solid_letters = tuple(solid_letters)
+        key = (animation, frame_index, facing_right, solid_letters, size)
+        bitboard = self.bitboards.get(key)
+        if bitboard is None:
+            bitboard = self._build_bitboard(animation, frame_index, facing_right,
+                                            solid_letters, size)
+            self.bitboards[key] = bitboard
+        return bitboard
+
+    def _build_bitboard(self, animation: str, frame_index: int, facing_right: bool,
+                        solid_letters: Tuple[str, ...],
+                        size: Optional[Tuple[int, int]]) -> Tuple[int, ...]:
+        """Empaqueta las filas del frame en enteros"""
+        frame = self.animations[animation][frame_index]
+        columns = self.frame_size(animation, frame_index)[0] // self.pixel_size
+        max_columns, max_rows = columns, len(frame)
+        if size is not None:
+            max_columns = min(max_columns, -(-size[0] // self.pixel_size))
+            max_rows = min(max_rows, -(-size[1] // self.pixel_size))
+
+        rows = []
+        for row in frame[:max_rows]:
+            bits = 0
+            for col_index, pixel in enumerate(row):
+                column = col_index if facing_right else columns - 1 - col_index
+                if pixel in solid_letters and column < max_columns:
+                    bits |= 1 << column
+            rows.append(bits)
+        return tuple(rows)
+
+    def _new_indexed_surface(self, size: Tuple[int, int]) -> pygame.Surface:
+        """Crea una superficie de 8 bits con el índice transparente como colorkey"""
+        surface = pygame.Surface((max(1, size[0]), max(1, size[1])), depth=8)
+        surface.fill(TRANSPARENT_INDEX)
+        surface.set_colorkey(TRANSPARENT_INDEX)
+        return surface
+
+    def _compile_frame(self, animation: str, frame_index: int,
+                       facing_right: bool) -> pygame.Surface:
+        """Dibuja el frame una única vez con un índice de paleta por letra"""
+        frame = self.animations[animation][frame_index]
+        surface = self._new_indexed_surface(self.frame_size(animation, frame_index))
+
+        for row_index, row in enumerate(frame):
+            for col_index, pixel in enumerate(row):
+                index = self.letter_indices.get(pixel)
+                if index:
+                    surface.fill(index, (col_index * self.pixel_size,
+                                         row_index * self.pixel_size,
+                                         self.pixel_size, self.pixel_size))
+
+        if not facing_right:
+            surface = pygame.transform.flip(surface, True, False)
+        return surface
+
+    def blit(self, screen: pygame.Surface, surface: pygame.Surface,
+             palette: Sequence[Color], position: Tuple[float, float]) -> pygame.Rect:
+        """Aplica la paleta del estilo y dibuja el frame con un solo blit.
+
+        Sobre una cola de dibujo la paleta viaja con el comando, ya que la
+        superficie del atlas es compartida.
+        """
+        if isinstance(screen, RenderQueue):
+            return screen.submit(surface, position, palette=palette)
+        surface.set_palette(palette)
+        return screen.blit(surface, position)
+
+    def clear(self) -> None:
+        """Limpia los frames compilados, sus variantes y las formas de colisión"""
+        self.frames.clear()
+        self.crossfades.clear()
+        self.variants.clear()
+        self.masks.clear()
+        self.bitboards.clear()
+
+
+# Atlas compartidos entre todas las instancias de un mismo estilo
+_atlases: Dict[Tuple[str, int], SpriteAtlas] = {}
+
+
+def get_atlas(style_name: str, animations: Dict[str, List[List[str]]],
+              pixel_size: int, letters: Sequence[str]) -> SpriteAtlas:
+    """Obtiene (o crea) el atlas compartido para un estilo y tamaño de píxel"""
+    key = (style_name, pixel_size)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = SpriteAtlas(animations, pixel_size, letters)
+        _atlases[key] = atlas
+    return atlas
@@ -0,0 +1,96 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+Color = Tuple[int, int, int]
+
+# Textos renderizados que se mantienen vivos en el LRU
+MAX_RENDERED_TEXTS = 256
+# Caracteres que se pre-renderizan para los contadores
+COUNTER_GLYPHS = "0123456789-+x:s%"
+
+_fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+_rendered: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+
+
+def get_font(name: Optional[str] = None, size: int = 36) -> pygame.font.Font:
+    """Obtiene una fuente del registro, resolviéndola con SysFont solo una vez"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+def render_text(text: str, color: Color, size: int = 36,
+                name: Optional[str] = None) -> pygame.Surface:
+    """Renderiza un texto con antialiasing pasando por el LRU de textos"""
+    key = (text, tuple(color), size, name)
+    surface = _rendered.get(key)
+    if surface is not None:
+        _rendered.move_to_end(key)
+        return surface
+
+    surface = get_font(name, size).render(text, True, color)
+    _rendered[key] = surface
+    if len(_rendered) > MAX_RENDERED_TEXTS:
+        _rendered.popitem(last=False)
+    return surface
+
+
+def draw_text(screen: pygame.Surface, text: str, color: Color, position: Tuple[float, float],
+              size: int = 36, name: Optional[str] = None) -> pygame.Rect:
+    """Dibuja un texto cacheado y devuelve el área que ocupa"""
+    return screen.blit(render_text(text, color, size, name), position)
+
+
+class GlyphAtlas:
+    """Glifos pre-renderizados de una fuente y color para textos que cambian a menudo"""
+
+    def __init__(self, font: pygame.font.Font, color: Color, charset: str = COUNTER_GLYPHS):
+        self.font = font
+        self.color = color
+        self.glyphs = {char: font.render(char, True, color) for char in charset}
+        self.space = font.size(" ")[0]
+
+    def draw(self, screen: pygame.Surface, text: str, position: Tuple[float, float]) -> pygame.Rect:
+        """Dibuja el texto glifo a glifo con un solo lote de blits"""
+        x, y = position
+        start_x = x
+        height = self.font.get_height()
+        blits = []
+        for char in text:
+            glyph = self.glyphs.get(char)
+            if glyph is None:
+                if char == " ":
+                    x += self.space
+                    continue
+                glyph = self.font.render(char, True, self.color)
+                self.glyphs[char] = glyph
+            blits.append((glyph, (x, y)))
+            x += glyph.get_width()
+        screen.blits(blits, doreturn=False)
+        return pygame.Rect(start_x, y, x - start_x, height)
+
+
+_glyph_atlases: Dict[tuple, GlyphAtlas] = {}
+
+
+def get_glyph_atlas(color: Color, size: int = 36, name: Optional[str] = None) -> GlyphAtlas:
+    """Obtiene el atlas de glifos para una fuente, tamaño y color"""
+    key = (tuple(color), size, name)
+    atlas = _glyph_atlases.get(key)
+    if atlas is None:
+        atlas = GlyphAtlas(get_font(name, size), color)
+        _glyph_atlases[key] = atlas
+    return atlas
+
+
+def draw_counter(screen: pygame.Surface, label: str, value: str, color: Color,
+                 position: Tuple[float, float], size: int = 36,
+                 name: Optional[str] = None) -> pygame.Rect:
+    """Dibuja 'etiqueta + valor': la etiqueta sale del LRU y el valor del atlas de glifos"""
+    label_rect = draw_text(screen, label, color, position, size, name)
+    value_rect = get_glyph_atlas(color, size, name).draw(screen, value, label_rect.topright)
+    return label_rect.union(value_rect)
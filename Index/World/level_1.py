@@ -9,19 +9,45 @@ import time
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from Index.Player.player import Player
-from Index.World.style_worlds import draw_gradient_background
+from Index.World.style_worlds import (draw_gradient_background, prepare_background, get_background,
+                                      build_pending_backgrounds)
 from Index.World.procedural_levels import generate_platforms
 from Index.Enemies.enemie import Enemy
-from Index.Menu.menu_system import Menu, Settings, change_screen_resolution
+from Index.Menu.menu_system import Menu, Settings, change_screen_resolution, SCREEN_RESOLUTIONS
 from Index.Utils.collision_helper import CollisionHelper
+from Index.Utils.particle_engine import get_particle_system
+from Index.Utils.text_cache import get_font, render_text
+from Index.Utils.sprite_atlas import prepare_surface
+from Index.Menu.hud import HUD
+from Index.Utils.dirty_rects import DirtyRectRenderer
+from Index.Utils.render_target import RenderTarget, LOGICAL_SIZE
+from Index.Utils.layer_compositor import LayerCompositor
+from Index.Utils.render_queue import RenderQueue
+from Index.Utils.oscillators import get_oscillator_bank
+from Index.Utils.fixed_timestep import FixedTimestep
 
 # Initialize Pygame and mixer for sound
 pygame.init()
 pygame.mixer.init()
 
-# Screen dimensions
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 450
+# Dimensiones lógicas del juego: la ventana puede tener otro tamaño y el
+# frame se escala al presentarlo
+SCREEN_WIDTH, SCREEN_HEIGHT = LOGICAL_SIZE
+
+# Presentar solo las regiones que cambiaron en lugar de la pantalla completa
+USE_DIRTY_RECTS = True
+# Escalar el frame lógico solo por factores enteros (píxeles nítidos)
+INTEGER_SCALING = False
+# Segundos entre refrescos de la capa cacheada de plataformas
+STATIC_WORLD_REFRESH = 1/20
+# La simulación avanza a paso fijo; el dibujado va a la tasa de refresco
+SIMULATION_STEP = 1/60
+MAX_SIMULATION_STEPS = 5
+RENDER_FPS = 144
+# Desplazamientos mayores en un paso (reaparición, cambio de nivel) no se interpolan
+TELEPORT_DISTANCE = 100
+# Colisión entre personajes con bitboards por celda en lugar de máscaras de píxel
+USE_BITBOARD_COLLISIONS = True
 
 # Colors
 WHITE = (255, 255, 255)
@@ -40,89 +66,20 @@ combo = 0
 combo_timer = 0
 max_combo = 0
 
-class ParticleSystem:
-    def __init__(self):
-        self.particles = []
-        self.particle_surfaces = {}
-        self.max_particles = 200
-        
-    def _get_particle_surface(self, size: int, color: tuple) -> pygame.Surface:
-        """Obtiene o crea una superficie pre-renderizada para partículas"""
-        key = (size, color)
-        if key not in self.particle_surfaces:
-            surf = pygame.Surface((size, size), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (*color, 255), (size//2, size//2), size//2)
-            self.particle_surfaces[key] = surf
-        return self.particle_surfaces[key]
-    
-    def add_particle(self, x: float, y: float, color: tuple, velocity_x: float, 
-                    velocity_y: float, lifetime: float = 1.0, size: int = 5):
-        """Añade una nueva partícula si no se excede el límite"""
-        if len(self.particles) < self.max_particles:
-            self.particles.append({
-                'x': x, 'y': y,
-                'vx': velocity_x, 'vy': velocity_y,
-                'color': color,
-                'lifetime': lifetime,
-                'max_lifetime': lifetime,
-                'size': size
-            })
-    
-    def update(self, dt: float) -> None:
-        """Actualiza todas las partículas con física optimizada"""
-        # Actualizar en lote para mejor rendimiento
-        for particle in self.particles[:]:
-            # Actualizar posición con integración de Verlet
-            particle['x'] += particle['vx'] * dt
-            particle['y'] += particle['vy'] * dt
-            particle['vy'] -= 500 * dt  # Gravedad
-            
-            # Actualizar tiempo de vida
-            particle['lifetime'] -= dt
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
-    
-    def draw(self, screen: pygame.Surface) -> None:
-        """Dibuja las partículas con técnicas de renderizado optimizadas"""
-        # Agrupar partículas por tamaño y color para minimizar cambios de superficie
-        particle_groups = {}
-        for particle in self.particles:
-            key = (particle['size'], particle['color'])
-            if key not in particle_groups:
-                particle_groups[key] = []
-            particle_groups[key].append(particle)
-        
-        # Dibujar cada grupo de partículas
-        for (size, color), group in particle_groups.items():
-            surface = self._get_particle_surface(size, color)
-            
-            # Dibujar todas las partículas del mismo tipo en lote
-            for particle in group:
-                # Calcular alpha basado en tiempo de vida
-                alpha = int(255 * (particle['lifetime'] / particle['max_lifetime']))
-                if alpha > 0:
-                    # Crear copia con alpha ajustado
-                    temp_surf = surface.copy()
-                    temp_surf.set_alpha(alpha)
-                    
-                    # Dibujar partícula
-                    screen.blit(temp_surf,
-                              (particle['x'] - size//2,
-                               screen.get_height() - particle['y'] - size//2))
-                               
-    def create_explosion(self, x: float, y: float, color: tuple,
-                        num_particles: int = 20, spread: float = 200):
-        """Crea una explosión de partículas con efecto mejorado"""
-        for _ in range(num_particles):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(100, spread)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            lifetime = random.uniform(0.5, 1.5)
-            size = random.randint(3, 7)
-            self.add_particle(x, y, color, vx, vy, lifetime, size)
-
 class PowerUp:
+    # Color según el tipo de power-up
+    COLORS = {
+        'speed': (255, 255, 0),    # Amarillo
+        'jump': (0, 255, 0),       # Verde
+        'shield': (0, 255, 255)    # Cian
+    }
+    # Ciclo común del tamaño (sin 4t) y la intensidad (|sin 3t|) del brillo
+    GLOW_CYCLE = math.pi
+    GLOW_FRAMES = 48
+    # Desfases posibles dentro del ciclo, para que no todos latan a la vez
+    PHASE_SLOTS = 8
+    _glow_frames = {}
+    
     def __init__(self, x, y, type):
         self.x = x
         self.y = y
@@ -136,83 +93,85 @@ class PowerUp:
         self.float_speed = 2
         self.float_range = 10
         self.glow_intensity = 0
-        self.particles = []
-        self.time_active = 0
+        self.particle_emitter = get_particle_system().create_emitter()
+        # Osciladores del reloj global desplazados por un desfase compartido
+        self.oscillators = get_oscillator_bank()
+        self.time_offset = random.randrange(self.PHASE_SLOTS) * self.GLOW_CYCLE / self.PHASE_SLOTS
+        self._float_wave = self.oscillators.register(self.float_speed,
+                                                     self.float_speed * self.time_offset)
+        self._glow_wave = self.oscillators.register(3, 3 * self.time_offset)
         
     def update(self, dt):
-        self.time_active += dt
+        waves = self.oscillators.values
         
         # Animación flotante suave
-        self.animation_offset = math.sin(self.time_active * self.float_speed) * self.float_range
+        self.animation_offset = waves[self._float_wave] * self.float_range
         
         # Efecto de brillo pulsante
-        self.glow_intensity = abs(math.sin(self.time_active * 3)) * 0.5
+        self.glow_intensity = abs(waves[self._glow_wave]) * 0.5
         
-        # Actualizar partículas existentes
-        for particle in self.particles[:]:
-            particle['lifetime'] -= dt
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
-                continue
-                
-            particle['x'] += particle['vx'] * dt
-            particle['y'] += particle['vy'] * dt
-            particle['alpha'] = int(255 * (particle['lifetime'] / particle['max_lifetime']))
+        # Las partículas siguen la animación flotante del power-up
+        self.particle_emitter.set_origin(0, self.animation_offset)
         
-        # Generar nuevas partículas
+        # Generar nuevas partículas (el motor compartido las integra y dibuja)
         if random.random() < 0.1:
             angle = random.uniform(0, math.pi * 2)
             speed = random.uniform(20, 50)
-            self.particles.append({
-                'x': self.x + self.width/2,
-                'y': self.y + self.height/2,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'lifetime': random.uniform(0.5, 1.0),
-                'max_lifetime': 1.0,
-                'alpha': 255
-            })
+            self.particle_emitter.emit(self.x + self.width/2, self.y + self.height/2,
+                                       self.COLORS[self.type],
+                                       math.cos(angle) * speed,
+                                       math.sin(angle) * speed,
+                                       random.uniform(0.5, 1.0),
+                                       size=5, max_lifetime=1.0)
         
     def draw(self, screen):
         if not self.active:
             return
-            
-        # Color según el tipo de power-up
-        colors = {
-            'speed': (255, 255, 0),    # Amarillo
-            'jump': (0, 255, 0),       # Verde
-            'shield': (0, 255, 255)    # Cian
-        }
-        base_color = colors[self.type]
-        
-        # Dibujar partículas
-        for particle in self.particles:
-            color = (*base_color, particle['alpha'])
-            pos = (int(particle['x']), int(particle['y'] + self.animation_offset))
-            pygame.draw.circle(screen, color, pos, 2)
         
-        # Dibujar efecto de brillo
-        glow_size = self.width + 10 + math.sin(self.time_active * 4) * 4
-        glow_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-        glow_color = (*base_color, int(128 * self.glow_intensity))
-        pygame.draw.circle(glow_surface, glow_color,
-                         (glow_size//2, glow_size//2), glow_size//2)
+        # Frame pre-renderizado de la animación de brillo para este instante
+        frames = self.get_glow_frames(self.type)
+        cycle_time = self.oscillators.time + self.time_offset
+        phase = (cycle_time % self.GLOW_CYCLE) / self.GLOW_CYCLE
+        frame = frames[int(phase * self.GLOW_FRAMES) % self.GLOW_FRAMES]
         
         # Posición con animación flotante
         y_pos = self.y + self.animation_offset
-        screen.blit(glow_surface,
-                   (self.x + self.width//2 - glow_size//2,
-                    y_pos + self.height//2 - glow_size//2))
+        return screen.blit(frame, (self.x + self.width/2 - frame.get_width()/2,
+                                   y_pos + self.height/2 - frame.get_height()/2))
+    
+    @classmethod
+    def get_glow_frames(cls, type):
+        """Frames cacheados del ciclo de brillo (tamaño e intensidad) de un tipo"""
+        frames = cls._glow_frames.get(type)
+        if frames is None:
+            frames = [cls._render_glow_frame(type, i / cls.GLOW_FRAMES * cls.GLOW_CYCLE)
+                      for i in range(cls.GLOW_FRAMES)]
+            cls._glow_frames[type] = frames
+        return frames
+    
+    @classmethod
+    def _render_glow_frame(cls, type, t, width=20, height=20):
+        """Dibuja brillo, cuerpo y borde del power-up en el instante t del ciclo"""
+        base_color = cls.COLORS[type]
+        glow_intensity = abs(math.sin(t * 3)) * 0.5
+        size = width + 10 + 4  # Tamaño máximo del brillo
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        center = size // 2
+        
+        # Dibujar efecto de brillo
+        glow_size = int(width + 10 + math.sin(t * 4) * 4)
+        glow_color = (*base_color, int(128 * glow_intensity))
+        pygame.draw.circle(surface, glow_color, (center, center), glow_size//2)
         
         # Dibujar power-up principal
-        pygame.draw.rect(screen, base_color,
-                        (self.x, y_pos, self.width, self.height))
+        body = pygame.Rect(center - width//2, center - height//2, width, height)
+        pygame.draw.rect(surface, base_color, body)
         
         # Dibujar borde brillante con efecto pulsante
-        border_color = tuple(min(255, c + int(100 * self.glow_intensity))
+        border_color = tuple(min(255, c + int(100 * glow_intensity))
                            for c in base_color)
-        pygame.draw.rect(screen, border_color,
-                        (self.x, y_pos, self.width, self.height), 2)
+        pygame.draw.rect(surface, border_color, body, 2)
+        return prepare_surface(surface)
 
 # Añadir variables globales para power-ups
 power_ups = []
@@ -306,23 +265,14 @@ def remove_power_up_effect(effect_type, is_player=True):
     else:
         enemy.remove_power_up_effect(effect_type)
 
-def draw_power_up_effects(screen):
-    """Dibujar efectos activos en la UI"""
-    y_offset = 160  # Empezar debajo del score y combo
-    
-    for effect_type, duration in active_effects.items():
-        if duration > 0:
-            text = f"{effect_type.capitalize()}: {int(duration)}s"
-            color = (255, 255, 0) if effect_type == 'speed' else \
-                    (0, 255, 0) if effect_type == 'jump' else \
-                    (0, 255, 255)
-            
-            text_surf = pygame.font.SysFont(None, 36).render(text, True, color)
-            screen.blit(text_surf, (10, y_offset))
-            y_offset += 30
+# Motor de partículas compartido por todas las entidades
+particles = get_particle_system()
+# Servicio de colisiones del mundo (cuadrícula espacial persistente)
+collision_helper = CollisionHelper(USE_BITBOARD_COLLISIONS)
+oscillators = get_oscillator_bank()
 
-# Initialize particles
-particles = ParticleSystem()
+# HUD en modo retenido: solo se recompone cuando cambian sus valores
+hud = HUD()
 
 def create_damage_particles(x, y, amount):
     for _ in range(5):
@@ -331,14 +281,16 @@ def create_damage_particles(x, y, amount):
         particles.add_particle(x, y, RED, vx, vy, 0.5)
 
 def show_floating_text(screen, text, x, y, color, size=20):
-    font = pygame.font.SysFont(None, size)
-    text_surface = font.render(text, True, color)
-    screen.blit(text_surface, (x - text_surface.get_width()//2, 
+    text_surface = render_text(text, color, size)
+    return screen.blit(text_surface, (x - text_surface.get_width()//2, 
                               screen.get_height() - y))
 
-def show_game_over(screen, victory=False):
+def show_game_over(screen, victory=False, render_target=None):
     """Mostrar pantalla de Game Over con mensaje personalizado"""
-    font = pygame.font.SysFont(None, 72)
+    window = screen
+    if render_target is not None:
+        screen = render_target.get_surface(window)
+    font = get_font(None, 72)
     if victory:
         text = 'Victoria!'
         color = (0, 255, 0)  # Verde para victoria
@@ -349,6 +301,8 @@ def show_game_over(screen, victory=False):
     game_over_text = font.render(text, True, color)
     screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, 
                                 SCREEN_HEIGHT // 2 - game_over_text.get_height() // 2))
+    if render_target is not None:
+        render_target.present(window)
     pygame.display.flip()
     pygame.time.wait(3000)
 
@@ -366,6 +320,8 @@ def reset_level(current_level, screen_width, screen_height):
             platform.reset_position(current_level, screen_width, screen_height)
     else:
         platforms = generate_platforms(current_level, screen_width, screen_height)
+    collision_helper.set_static_objects(platforms)
+    compositor.invalidate('static_world')
 
     # Reset player position and attributes
     player.x = 100
@@ -385,57 +341,23 @@ def reset_level(current_level, screen_width, screen_height):
 
 def update_entities(player, enemy, platforms, dt):
     """Update all entities with optimized collision detection"""
-    # Actualizar cuadrícula espacial con todas las entidades
-    collision_helper = CollisionHelper()
-    all_entities = [player, enemy] + platforms
-    collision_helper.update_spatial_grid(all_entities)
-    
     # Guardar posiciones anteriores para resolución de colisiones
-    prev_player_y = player.y
-    prev_enemy_y = enemy.y
+    previous = [(player.x, player.y), (enemy.x, enemy.y)]
     
     # Actualizar entidades
     player.update(dt)
     enemy.update(player, [], dt)
     
-    # Manejar colisiones del jugador
-    for platform in platforms:
-        player_rect = pygame.Rect(player.x, player.y, player.style.width, player.style.height)
-        if player_rect.colliderect(platform.rect):
-            # Resolver colisión vertical
-            if player.velocity_y >= 0:  # Cayendo
-                if prev_player_y + player.style.height <= platform.rect.top:
-                    player.y = platform.rect.top - player.style.height
-                    player.velocity_y = 0
-                    player.is_jumping = False
-                    player.on_ground = True
-            elif player.velocity_y < 0:  # Subiendo
-                if prev_player_y >= platform.rect.bottom:
-                    player.y = platform.rect.bottom
-                    player.velocity_y = 0
-    
-    # Manejar colisiones del enemigo
-    for platform in platforms:
-        enemy_rect = pygame.Rect(enemy.x, enemy.y, enemy.style.width, enemy.style.height)
-        if enemy_rect.colliderect(platform.rect):
-            # Resolver colisión vertical
-            if enemy.velocity_y >= 0:  # Cayendo
-                if prev_enemy_y + enemy.style.height <= platform.rect.top:
-                    enemy.y = platform.rect.top - enemy.style.height
-                    enemy.velocity_y = 0
-                    enemy.is_jumping = False
-                    enemy.on_ground = True
-            elif enemy.velocity_y < 0:  # Subiendo
-                if prev_enemy_y >= platform.rect.bottom:
-                    enemy.y = platform.rect.bottom
-                    enemy.velocity_y = 0
-    
-# Verificar colisión entre jugador y enemigo
-    if collision_helper.check_pixel_perfect_collision(player, enemy):
-        enemy.check_player_collision(player)
+    # Resolver en un solo lote las colisiones con las plataformas cercanas
+    collision_helper.resolve_platforms((player, enemy), previous)
+    
+    # Actualizar en la cuadrícula solo las entidades que se mueven
+    collision_helper.update_spatial_grid((player, enemy))
     
-    # Limpiar caché
-    collision_helper.clear_cache()
+    # Verificar colisión entre jugador y enemigo si comparten celdas
+    if (enemy in collision_helper.get_potential_collisions(player)
+            and collision_helper.check_pixel_perfect_collision(player, enemy)):
+        enemy.check_player_collision(player)
     
     # Check for falls
     if check_entity_fall(player, SCREEN_HEIGHT):
@@ -445,39 +367,6 @@ def update_entities(player, enemy, platforms, dt):
     
     return False, False  # Continue current level
 
-def check_platform_collisions(entity, platforms, screen):
-    """Unified platform collision checking with adjusted collision height."""
-    entity_rect = pygame.Rect(
-        entity.x,
-        screen.get_height() - entity.y - entity.style.height - 10,  # Adjusted collision height
-        entity.style.width,
-        entity.style.height
-    )
-
-    for platform in platforms:
-        if entity_rect.colliderect(platform.rect):
-            # Get collision depth
-            dx = min(entity_rect.right - platform.rect.left, platform.rect.right - entity_rect.left)
-            dy = min(entity_rect.bottom - platform.rect.top, platform.rect.bottom - entity_rect.top)
-
-            # Determine collision side by comparing depths
-            if dx < dy:
-                if entity_rect.centerx < platform.rect.centerx:
-                    entity.x = platform.rect.left - entity.style.width
-                else:
-                    entity.x = platform.rect.right
-                entity.velocity_x = 0
-            else:
-                if entity_rect.centery < platform.rect.centery:
-                    entity.y = screen.get_height() - platform.rect.top - entity.style.height
-                    entity.velocity_y = 0
-                    entity.is_jumping = False
-                    return True  # On ground
-                else:
-                    entity.y = screen.get_height() - platform.rect.bottom
-                    entity.velocity_y = 0
-    return False
-
 def check_level_transition(player, screen_width):
     """Check if player has exited the screen horizontally"""
     if player.x < -50:  # Left exit
@@ -495,15 +384,22 @@ def reset_player_position(player, direction, screen_width):
     player.y = platforms[0].rect.top - 100  # Aparecer 100 pixels más arriba de la plataforma
     player.velocity_y = 0  # Resetear velocidad vertical
 
+def load_level_platforms():
+    """Generar las plataformas del nivel actual y registrarlas una vez en los servicios del mundo"""
+    global platforms
+    platforms = generate_platforms(current_level, SCREEN_WIDTH, SCREEN_HEIGHT)
+    collision_helper.set_static_objects(platforms)
+    compositor.invalidate('static_world')
+
 def initialize_game():
-    global platforms, player, enemy, current_level, score, combo, combo_timer, max_combo
+    global player, enemy, current_level, score, combo, combo_timer, max_combo
     current_level = 1
     score = 0
     combo = 0
     combo_timer = 0
     max_combo = 0
     
-    platforms = generate_platforms(current_level, SCREEN_WIDTH, SCREEN_HEIGHT)
+    load_level_platforms()
     player_x = 100
     player_y = platforms[0].rect.top - 100  # Aparecer 100 pixels más arriba de la plataforma
     enemy_x = SCREEN_WIDTH - 200
@@ -513,19 +409,22 @@ def initialize_game():
     enemy = Enemy(x=enemy_x, y=enemy_y)
 
 def update_game_state(dt):
-    global combo_timer, combo, current_level, platforms, score
+    global combo_timer, combo, current_level, score
+    
+    # Evaluar una vez todos los osciladores de las animaciones del frame
+    oscillators.tick(dt)
     
     # Actualizar entidades con sistema de colisiones optimizado
     player_fell, enemy_fell = update_entities(player, enemy, platforms, dt)
     
-    # Actualizar sistemas visuales
+    # Actualizar sistemas visuales (un solo pase para todas las partículas)
     particles.update(dt)
     for platform in platforms:
         platform.update(dt)
     
     # Actualizar power-ups y pasar la lista al enemigo
     update_power_ups(dt)
-    enemy.update(player, platforms, dt, power_ups)  # Pasar power_ups al enemigo
+    enemy.update(player, collision_helper, dt, power_ups)  # Pasar power_ups al enemigo
     
     # Generar power-up aleatorio con más frecuencia
     if len(power_ups) < 3 and random.random() < 0.02:  # Aumentada probabilidad
@@ -541,65 +440,126 @@ def update_game_state(dt):
     level_changed, exit_direction = check_level_transition(player, SCREEN_WIDTH)
     if level_changed:
         current_level += 1
-        platforms = generate_platforms(current_level, SCREEN_WIDTH, SCREEN_HEIGHT)
+        load_level_platforms()
         reset_player_position(player, exit_direction, SCREEN_WIDTH)
         enemy.x = SCREEN_WIDTH // 2
         enemy.y = platforms[0].rect.top - 300  # Aparecer más arriba que la plataforma
 
-def draw_game_state(screen):
-    draw_gradient_background(screen)
-    for platform in platforms:
-        platform.draw(screen)
-    
+def draw_background_layer(screen):
+    return get_background(*screen.get_size()).draw_gradient(screen)
+
+def draw_stars_layer(screen):
+    return get_background(*screen.get_size()).draw_stars(screen)
+
+def draw_static_world_layer(screen):
+    return [platform.draw(screen) for platform in platforms]
+
+def draw_entities_layer(screen):
+    rects = []
     # Dibujar power-ups
     for power_up in power_ups:
-        power_up.draw(screen)
+        rects.append(power_up.draw(screen))
     
     if player.invulnerable:
         if int(player.invulnerable_timer * 10) % 2:
-            player.draw(screen)
+            rects.append(player.draw(screen))
     else:
-        player.draw(screen)
+        rects.append(player.draw(screen))
         
     if enemy.invulnerable:
         if int(enemy.invulnerable_timer * 10) % 2:
-            enemy.draw(screen)
+            rects.append(enemy.draw(screen))
     else:
-        enemy.draw(screen)
-    
-    particles.draw(screen)
-    
-    # Draw UI
-    font = pygame.font.SysFont(None, 36)
-    pygame.draw.rect(screen, RED, (10, 10, 200, 20))
-    pygame.draw.rect(screen, GREEN, (10, 10, 200 * (player.health/100), 20))
-    pygame.draw.rect(screen, RED, (SCREEN_WIDTH-210, 10, 200, 20))
-    pygame.draw.rect(screen, GREEN, (SCREEN_WIDTH-210, 10, 200 * (enemy.health/100), 20))
-    
-    score_text = font.render(f'Score: {score}', True, WHITE)
-    combo_text = font.render(f'Combo: {combo}x', True, YELLOW if combo > 1 else WHITE)
-    level_text = font.render(f'Level: {current_level}', True, WHITE)
-    
-    screen.blit(score_text, (10, 40))
-    screen.blit(combo_text, (10, 80))
-    screen.blit(level_text, (10, 120))
-    
-    # Dibujar efectos activos
-    draw_power_up_effects(screen)
+        rects.append(enemy.draw(screen))
+    return rects
+
+def draw_hud_layer(screen):
+    hud.update(score, combo, current_level, player.health, enemy.health, active_effects)
+    rects = hud.draw(screen)
     
     if enemy.invulnerable:
-        show_floating_text(screen, "20!", enemy.x, enemy.y + 50, RED, 30)
+        rects.append(show_floating_text(screen, "20!", enemy.x, enemy.y + 50, RED, 30))
+    return rects
+
+# Capas del frame de juego: el gradiente y las plataformas se cachean; las
+# plataformas se refrescan a menor frecuencia para su animación lenta
+render_queue = RenderQueue()
+compositor = LayerCompositor(render_queue)
+compositor.add_layer('background', draw_background_layer, cached=True, opaque=True)
+compositor.add_layer('stars', draw_stars_layer)
+compositor.add_layer('static_world', draw_static_world_layer, cached=True,
+                     refresh_interval=STATIC_WORLD_REFRESH)
+compositor.add_layer('entities', draw_entities_layer)
+# Un solo pase de dibujo para las partículas de todos los emisores
+compositor.add_layer('particles', particles.draw)
+compositor.add_layer('hud', draw_hud_layer)
+
+def draw_game_state(screen, dt=1/60):
+    """Dibuja el frame de juego y devuelve las áreas que cambiaron"""
+    get_background(*screen.get_size()).update(dt)
+    return compositor.draw(screen, dt)
+
+# Posiciones de las entidades antes del último paso de simulación
+previous_positions = []
+
+def snapshot_positions():
+    """Guardar las posiciones antes de un paso de simulación para interpolar el dibujado"""
+    global previous_positions
+    previous_positions = [(entity, entity.x, entity.y) for entity in (player, enemy)]
+
+def draw_interpolated_game_state(screen, dt, alpha):
+    """Dibuja el estado interpolado entre el paso anterior y el actual"""
+    current_positions = [(entity, entity.x, entity.y) for entity, _, _ in previous_positions]
+    for entity, x, y in previous_positions:
+        if math.hypot(entity.x - x, entity.y - y) < TELEPORT_DISTANCE:
+            entity.x = x + (entity.x - x) * alpha
+            entity.y = y + (entity.y - y) * alpha
+    try:
+        return draw_game_state(screen, dt)
+    finally:
+        for entity, x, y in current_positions:
+            entity.x, entity.y = x, y
+
+def simulate_step(keys, dt):
+    """Avanza la simulación un paso fijo con la entrada actual"""
+    global score, combo, combo_timer, max_combo
+    moving = keys[pygame.K_LEFT] or keys[pygame.K_RIGHT]
+    player.style.update_animation(dt, moving, player.is_jumping, player.is_attacking)
+    
+    if keys[pygame.K_LEFT]:
+        player.move_left(dt)
+    if keys[pygame.K_RIGHT]:
+        player.move_right(dt)
+    if keys[pygame.K_a]:
+        player.attack()
+        if abs(player.x - enemy.x) < 60 and abs(player.y - enemy.y) < 60:
+            knockback_x = 500 if player.facing_right else -500
+            enemy.take_damage(20, knockback_x, 300)
+            particles.create_explosion(enemy.x, enemy.y, RED, 20, 200)
+            combo += 1
+            combo_timer = 2.0
+            score += 100 * combo
+            max_combo = max(max_combo, combo)
+    
+    snapshot_positions()
+    update_game_state(dt)
+
+def prepare_resolution_backgrounds():
+    """Encolar los fondos de todas las resoluciones seleccionables (uno por frame)"""
+    for width, height in SCREEN_RESOLUTIONS:
+        prepare_background(width, height)
+    for width, height in pygame.display.get_desktop_sizes():
+        prepare_background(width, height)
 
 def reset_game_state():
-    global platforms
-    platforms = generate_platforms(current_level, SCREEN_WIDTH, SCREEN_HEIGHT)
+    load_level_platforms()
     reset_player_position(player, "right", SCREEN_WIDTH)
     enemy.x = SCREEN_WIDTH // 2
     enemy.y = platforms[0].rect.top - 300  # Aparecer más arriba que la plataforma
     enemy.velocity_y = 0
 
 def main():
-    global score, combo, combo_timer, max_combo, current_level, SCREEN_WIDTH, SCREEN_HEIGHT
+    global score, current_level
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Mi Juego")
     clock = pygame.time.Clock()
@@ -613,6 +573,10 @@ def main():
     # Inicializar componentes
     menu = Menu(screen)
     settings = Settings(screen)
+    renderer = DirtyRectRenderer(enabled=USE_DIRTY_RECTS)
+    game_target = RenderTarget((SCREEN_WIDTH, SCREEN_HEIGHT), integer_scale=INTEGER_SCALING)
+    previous_state = current_state
+    timestep = FixedTimestep(SIMULATION_STEP, MAX_SIMULATION_STEPS)
     game_initialized = False
     current_difficulty = 1  # Normal por defecto
     
@@ -621,7 +585,9 @@ def main():
     
     running = True
     while running:
-        dt = clock.tick(60) / 1000.0
+        dt = clock.tick(RENDER_FPS) / 1000.0
+        # Fondos de otras resoluciones: como mucho uno por frame, en este hilo
+        build_pending_backgrounds()
         
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -639,6 +605,7 @@ def main():
                 elif action == 'settings':
                     current_state = SETTINGS
                     settings = Settings(screen)
+                    prepare_resolution_backgrounds()
                     
             elif current_state == SETTINGS:
                 action, value = settings.handle_event(event)
@@ -647,20 +614,20 @@ def main():
                     menu = Menu(screen)
                 elif action == 'change_resolution':
                     screen = change_screen_resolution(screen, value)
-                    SCREEN_WIDTH, SCREEN_HEIGHT = value
                     previous_resolution = value
                     settings = Settings(screen)
                     menu = Menu(screen)
+                    renderer.mark_full()
+                    compositor.invalidate()
                 elif action == 'toggle_fullscreen':
                     if settings.is_fullscreen:
                         screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                        SCREEN_WIDTH = screen.get_width()
-                        SCREEN_HEIGHT = screen.get_height()
                     else:
                         screen = pygame.display.set_mode(previous_resolution)
-                        SCREEN_WIDTH, SCREEN_HEIGHT = previous_resolution
                     settings = Settings(screen)
                     menu = Menu(screen)
+                    renderer.mark_full()
+                    compositor.invalidate()
                 elif action == 'change_difficulty':
                     current_difficulty = value
                     if enemy:  # Si el enemigo ya existe, actualizar su dificultad
@@ -673,51 +640,44 @@ def main():
                     elif event.key == pygame.K_SPACE:
                         player.jump()
                     elif event.key == pygame.K_LSHIFT:
-                        player.dash(dt)
+                        player.dash(SIMULATION_STEP)
         
-        # Actualizar y dibujar según el estado actual
+        # Actualizar y dibujar según el estado actual (el fondo avanza con el dt real)
+        background = lambda surface: draw_gradient_background(surface, dt)
+        if current_state != previous_state:
+            # Al cambiar de pantalla todo el contenido es distinto
+            renderer.mark_full()
+            timestep.reset()
+            previous_state = current_state
         if current_state == MENU:
-            menu.draw(draw_gradient_background)
+            renderer.mark(menu.draw(background))
         elif current_state == SETTINGS:
-            settings.draw(draw_gradient_background)
+            renderer.mark(settings.draw(background))
         elif current_state == GAME:
-            # Input handling
+            # Simular a paso fijo tantos pasos como tiempo real haya pasado
             keys = pygame.key.get_pressed()
-            moving = keys[pygame.K_LEFT] or keys[pygame.K_RIGHT]
-            player.style.update_animation(dt, moving, player.is_jumping, player.is_attacking)
-            
-            if keys[pygame.K_LEFT]:
-                player.move_left(dt)
-            if keys[pygame.K_RIGHT]:
-                player.move_right(dt)
-            if keys[pygame.K_a]:
-                player.attack()
-                if abs(player.x - enemy.x) < 60 and abs(player.y - enemy.y) < 60:
-                    knockback_x = 500 if player.facing_right else -500
-                    enemy.take_damage(20, knockback_x, 300)
-                    particles.create_explosion(enemy.x, enemy.y, RED, 20, 200)
-                    combo += 1
-                    combo_timer = 2.0
-                    score += 100 * combo
-                    max_combo = max(max_combo, combo)
+            for _ in range(timestep.advance(dt)):
+                simulate_step(keys, SIMULATION_STEP)
             
-            # Update game state
-            update_game_state(dt)
-            # Draw game state
-            draw_game_state(screen)
+            # Dibujar a resolución lógica y escalar una sola vez a la ventana
+            frame = game_target.get_surface(screen)
+            rects = draw_interpolated_game_state(frame, dt, timestep.alpha)
+            renderer.mark(game_target.present(screen, rects))
             
             if player.health <= 0:
-                show_game_over(screen, victory=False)
+                show_game_over(screen, victory=False, render_target=game_target)
                 current_state = MENU
                 game_initialized = False
             elif enemy.health <= 0:
-                show_game_over(screen, victory=True)
+                show_game_over(screen, victory=True, render_target=game_target)
                 score += 1000 * current_level
                 enemy.health = enemy.max_health
                 current_level += 1
                 reset_game_state()
+                renderer.mark_full()
+                timestep.reset()
         
-        pygame.display.flip()
+        renderer.present()
 
 if __name__ == "__main__":
     main()
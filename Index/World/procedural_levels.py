@@ -1,6 +1,58 @@
 import random
 import pygame
 import math
+import numpy as np
+from Index.Utils.particle_engine import get_particle_system
+from Index.Utils.oscillators import get_oscillator_bank
+from Index.Utils.render_queue import RenderQueue
+
+# Niveles de fase para el brillo de los bloques (índices de paleta 1..SHIMMER_STEPS)
+SHIMMER_STEPS = 64
+PATTERN_INDEX = SHIMMER_STEPS + 1
+DETAIL_INDEX = SHIMMER_STEPS + 2
+
+# Patrón de bloques pre-renderizado por tamaño de plataforma
+_block_layouts = {}
+
+def _get_block_layout(width, height, block_size):
+    """Obtiene la superficie indexada con el patrón de bloques de un tamaño dado.
+
+    Cada bloque guarda el índice de su fase de brillo, así que la animación de
+    color de todos los bloques es un único set_palette por frame.
+    """
+    key = (width, height, block_size)
+    layout = _block_layouts.get(key)
+    if layout is not None:
+        return layout
+
+    num_blocks_x = width // block_size
+    num_blocks_y = height // block_size
+    layout = pygame.Surface((max(1, num_blocks_x * block_size),
+                             max(1, num_blocks_y * block_size)), depth=8)
+    for y in range(num_blocks_y):
+        for x in range(num_blocks_x):
+            block_x = x * block_size
+            block_y = y * block_size
+
+            # Fase de la variación de color del bloque, cuantizada
+            phase = (x * 0.3 + y * 0.2) % (math.pi * 2)
+            shimmer_index = 1 + int(phase / (math.pi * 2) * SHIMMER_STEPS) % SHIMMER_STEPS
+            layout.fill(shimmer_index, (block_x, block_y, block_size, block_size))
+
+            # Patrón de cuadrícula con brillo
+            if (x + y) % 2 == 0:
+                layout.fill(PATTERN_INDEX, (block_x + 2, block_y + 2,
+                                            block_size - 4, block_size - 4))
+
+            # Detalles aleatorios pero consistentes
+            if (x * 73856093 ^ y * 19349663) % 7 == 0:
+                layout.fill(DETAIL_INDEX, (block_x + block_size//4,
+                                           block_y + block_size//4,
+                                           block_size//2,
+                                           block_size//2))
+
+    _block_layouts[key] = layout
+    return layout
 
 class Platform:
     def __init__(self, x, y, width, height):
@@ -14,10 +66,17 @@ class Platform:
             'detail': (160, 82, 45)      # Siena para detalles
         }
         self.block_size = 16
-        self.time_active = 0
+        self.oscillators = get_oscillator_bank()
+        self._glow_wave = self.oscillators.register(2)
+        # Un oscilador por fase de brillo de los bloques, compartidos entre plataformas
+        self._shimmer_waves = self.oscillators.register_many(
+            1, ((step + 0.5) / SHIMMER_STEPS * math.pi * 2 for step in range(SHIMMER_STEPS)))
         self.wave_phases = [random.random() * math.pi * 2 for _ in range(4)]
         self.glow_intensity = 0
-        self.particles = []
+        self.particle_emitter = get_particle_system().create_emitter()
+        self._edge_strip = None
+        self._shadow_strip = None
+        self._edge_phase = None
         
     def get_spawn_position(self):
         """Returns a valid spawn position above this platform"""
@@ -25,117 +84,88 @@ class Platform:
 
     def update(self, dt):
         """Actualiza las animaciones de la plataforma con efectos mejorados"""
-        self.time_active += dt
-        
         # Actualizar fases de ondulación
         for i in range(len(self.wave_phases)):
             self.wave_phases[i] += dt * (i + 1) * 0.5
         
         # Actualizar intensidad del brillo
-        self.glow_intensity = (math.sin(self.time_active * 2) + 1) * 0.5
-        
-        # Actualizar partículas existentes
-        for particle in self.particles[:]:
-            particle['lifetime'] -= dt
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
-                continue
-            
-            particle['y'] += particle['speed'] * dt
-            particle['alpha'] = int(255 * (particle['lifetime'] / particle['max_lifetime']))
+        self.glow_intensity = (self.oscillators.value(self._glow_wave) + 1) * 0.5
         
-        # Generar nuevas partículas ocasionalmente
+        # Generar nuevas partículas ocasionalmente (el motor compartido las integra)
         if random.random() < 0.02:
-            self.particles.append({
-                'x': random.randint(self.rect.left, self.rect.right),
-                'y': self.rect.top,
-                'speed': -20,  # Subir lentamente
-                'lifetime': random.uniform(0.5, 1.5),
-                'max_lifetime': 1.5,
-                'alpha': 255
-            })
+            self.particle_emitter.emit(random.randint(self.rect.left, self.rect.right),
+                                       self.rect.top, self.colors['highlight'],
+                                       0, -20,  # Subir lentamente
+                                       random.uniform(0.5, 1.5),
+                                       size=5, max_lifetime=1.5)
     
     def draw(self, screen):
         """Dibujar plataforma con efectos visuales mejorados"""
-        # Calcular ondulación para cada bloque
-        num_blocks_x = self.visual_rect.width // self.block_size
+        # Calcular ondulación para cada fila de bloques
         num_blocks_y = self.visual_rect.height // self.block_size
         
-        # Dibujar partículas detrás de la plataforma
-        for particle in self.particles:
-            alpha = particle['alpha']
-            color = (*self.colors['highlight'], alpha)
-            pygame.draw.circle(screen, color,
-                            (int(particle['x']), int(particle['y'])), 2)
-        
-        # Dibujar bloques con efectos
+        # Dibujar bloques desde el patrón pre-renderizado, una franja por fila
+        # El patrón es compartido entre plataformas del mismo tamaño: sobre una
+        # cola de dibujo la paleta viaja con cada comando
+        layout = _get_block_layout(self.visual_rect.width, self.visual_rect.height,
+                                   self.block_size)
+        palette = self._block_palette()
+        queued = isinstance(screen, RenderQueue)
+        if not queued:
+            layout.set_palette(palette)
         for y in range(num_blocks_y):
             wave_height = 0
             for phase in self.wave_phases:
                 wave_height += math.sin(y * 0.2 + phase) * 2
             
-            for x in range(num_blocks_x):
-                # Posición base del bloque
-                block_x = self.visual_rect.x + x * self.block_size
-                block_y = self.visual_rect.y + y * self.block_size + wave_height
-                
-                # Color base con variación
-                base_color = self.colors['main']
-                color_variation = math.sin(x * 0.3 + y * 0.2 + self.time_active) * 20
-                block_color = tuple(min(255, max(0, c + color_variation)) 
-                                  for c in base_color)
-                
-                # Dibujar bloque principal
-                pygame.draw.rect(screen, block_color,
-                               (block_x, block_y,
-                                self.block_size, self.block_size))
-                
-                # Añadir detalles y patrones
-                if (x + y) % 2 == 0:
-                    # Patrón de cuadrícula con brillo
-                    glow = self.glow_intensity * 50
-                    pattern_color = tuple(min(255, c + glow)
-                                       for c in self.colors['pattern'])
-                    pygame.draw.rect(screen, pattern_color,
-                                   (block_x + 2, block_y + 2,
-                                    self.block_size - 4, self.block_size - 4))
-                
-                # Detalles aleatorios pero consistentes
-                if hash(f"{x},{y}") % 7 == 0:
-                    pygame.draw.rect(screen, self.colors['detail'],
-                                   (block_x + self.block_size//4,
-                                    block_y + self.block_size//4,
-                                    self.block_size//2,
-                                    self.block_size//2))
+            position = (self.visual_rect.x,
+                        self.visual_rect.y + y * self.block_size + wave_height)
+            area = (0, y * self.block_size, layout.get_width(), self.block_size)
+            if queued:
+                screen.submit(layout, position, area=area, palette=palette)
+            else:
+                screen.blit(layout, position, area)
         
         # Efectos de borde
         self._draw_platform_edges(screen)
+        
+        # Área sucia: el rectángulo visual más la amplitud máxima de la ondulación
+        wave_margin = int(math.ceil(len(self.wave_phases) * 2))
+        return self.visual_rect.inflate(0, wave_margin * 2)
+    
+    def _block_palette(self):
+        """Paleta del patrón de bloques para el instante actual"""
+        # Color base con variación según la fase de cada bloque
+        variation = self.oscillators.values[self._shimmer_waves] * 20
+        shimmer = np.clip(np.array(self.colors['main'])[None, :] + variation[:, None], 0, 255)
+        palette = [(0, 0, 0)] + shimmer.astype(np.int64).tolist()
+        
+        glow = self.glow_intensity * 50
+        palette.append(tuple(int(min(255, c + glow)) for c in self.colors['pattern']))
+        palette.append(self.colors['detail'])
+        return palette
     
     def _draw_platform_edges(self, screen):
         """Dibujar efectos de borde de la plataforma"""
-        # Borde superior con brillo dinámico
-        for x in range(self.visual_rect.width):
-            progress = x / self.visual_rect.width
-            glow = math.sin(progress * math.pi + self.time_active * 2) * self.glow_intensity
-            # Asegurar que los valores de color estén entre 0 y 255
-            r = min(255, max(0, int(self.colors['highlight'][0] + glow * 100)))
-            g = min(255, max(0, int(self.colors['highlight'][1] + glow * 100)))
-            b = min(255, max(0, int(self.colors['highlight'][2] + glow * 100)))
-            highlight_color = (r, g, b)
-            
-            pygame.draw.line(screen, highlight_color,
-                           (self.visual_rect.x + x,
-                            self.visual_rect.y),
-                           (self.visual_rect.x + x + 1,
-                            self.visual_rect.y))
+        # Borde superior con brillo dinámico, calculado para toda la fila a la vez
+        width = self.visual_rect.width
+        if self._edge_strip is None or self._edge_strip.get_width() != width:
+            self._edge_strip = pygame.Surface((max(1, width), 1))
+            self._edge_phase = np.arange(width) / width * math.pi
+        
+        glow = np.sin(self._edge_phase + self.oscillators.time * 2) * self.glow_intensity
+        highlight = np.array(self.colors['highlight'], dtype=np.float64)
+        # Asegurar que los valores de color estén entre 0 y 255
+        strip = np.clip(highlight[None, :] + (glow * 100)[:, None], 0, 255).astype(np.uint8)
+        pygame.surfarray.blit_array(self._edge_strip, strip[:, None, :])
+        screen.blit(self._edge_strip, self.visual_rect.topleft)
         
-        # Borde inferior con sombra dinámica
+        # Borde inferior con sombra (una franja de un píxel, como la línea original)
         shadow_y = self.visual_rect.y + self.visual_rect.height - 1
-        pygame.draw.line(screen, self.colors['shadow'],
-                       (self.visual_rect.x,
-                        shadow_y),
-                       (self.visual_rect.x + self.visual_rect.width,
-                        shadow_y))
+        if self._shadow_strip is None or self._shadow_strip.get_width() != width + 1:
+            self._shadow_strip = pygame.Surface((width + 1, 1))
+        self._shadow_strip.fill(self.colors['shadow'])
+        screen.blit(self._shadow_strip, (self.visual_rect.x, shadow_y))
 
 def generate_platforms(level, screen_width, screen_height):
     platforms = []
@@ -1,26 +1,156 @@
 import pygame
 import math
-import time
-import random
+import numpy as np
 from typing import List, Tuple, Dict
+from Index.Utils.sprite_atlas import prepare_surface
+
+# Desplazamiento horizontal máximo de la ondulación del gradiente (en píxeles)
+WAVE_MARGIN = 2
+
+class Starfield:
+    """Campo de estrellas con paralaje guardado como estructura de arrays de NumPy.
+
+    Posiciones, velocidades, fases de parpadeo y trails viven en arrays, la
+    actualización es vectorizada y el dibujado usa sprites pre-renderizados por
+    nivel de alpha y tamaño de resplandor, enviados en lote con Surface.blits.
+    """
+    ALPHA_LEVELS = 16
+    GLOW_SIZE_LEVELS = 5
+    MAX_ALPHA = 255 * 1.6  # parpadeo (1.0) + resplandor global (0.6)
+
+    def __init__(self, width: int, height: int, layers: List[Dict],
+                 scroll_speed: float, density: float = 1.0):
+        self.width = width
+        self.height = height
+        
+        counts = [max(0, int(layer['count'] * density)) for layer in layers]
+        self.layer = np.repeat(np.arange(len(layers)), counts)
+        count = len(self.layer)
+        sizes = np.array([layer['size'] for layer in layers], dtype=np.float64)
+        speeds = np.array([layer['speed'] for layer in layers], dtype=np.float64)
+        trail_lengths = np.array([layer['trail_length'] for layer in layers], dtype=np.int64)
+        
+        self.x = np.random.randint(0, width + 1, count).astype(np.float64)
+        self.y = np.random.randint(0, height + 1, count).astype(np.float64)
+        self.size = sizes[self.layer]
+        # Paralaje basado en el tamaño (las estrellas más grandes se mueven más rápido)
+        self.velocity_x = speeds[self.layer] * scroll_speed * (self.size / 3)
+        self.blink_offset = np.random.random(count) * 6.28
+        
+        # Trails como buffer circular compartido: la columna trail_head es la más reciente
+        self.trail_length = trail_lengths[self.layer]
+        self.max_trail = int(trail_lengths.max()) if count else 0
+        self.trail_x = np.zeros((count, self.max_trail))
+        self.trail_y = np.zeros((count, self.max_trail))
+        self.trail_head = 0
+        self.trail_filled = 0
+        
+        self._create_sprites(layers)
+
+    def _create_sprites(self, layers: List[Dict]) -> None:
+        """Pre-renderiza núcleo, resplandor y trail por capa y nivel de alpha"""
+        self.core_sprites = []
+        self.glow_sprites = []
+        self.trail_sprites = []
+        self.glow_radius = np.zeros((len(layers), self.GLOW_SIZE_LEVELS))
+        
+        for layer_index, layer in enumerate(layers):
+            size = layer['size']
+            color = layer['color'][:3]
+            core = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(core, (255, 255, 255), (size//2, size//2), size//2)
+            
+            for alpha_level in range(self.ALPHA_LEVELS):
+                alpha = alpha_level / (self.ALPHA_LEVELS - 1) * self.MAX_ALPHA
+                core_variant = prepare_surface(core.copy())
+                core_variant.set_alpha(min(255, int(alpha)))
+                self.core_sprites.append(core_variant)
+                
+                trail = pygame.Surface((1, 1), pygame.SRCALPHA)
+                trail.fill((*color, int(alpha_level / (self.ALPHA_LEVELS - 1) * 255)))
+                self.trail_sprites.append(prepare_surface(trail))
+            
+            for glow_level in range(self.GLOW_SIZE_LEVELS):
+                wave = glow_level / (self.GLOW_SIZE_LEVELS - 1) * 2 - 1
+                radius = size * (1.5 + wave * 0.2)
+                self.glow_radius[layer_index, glow_level] = radius
+                for alpha_level in range(self.ALPHA_LEVELS):
+                    alpha = alpha_level / (self.ALPHA_LEVELS - 1) * self.MAX_ALPHA
+                    glow = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                    pygame.draw.circle(glow, (*color, int(alpha * 0.3)), (radius, radius), radius)
+                    self.glow_sprites.append(prepare_surface(glow))
+
+    def update(self, dt: float, current_time: float) -> None:
+        """Actualiza posiciones y trails de todas las estrellas a la vez"""
+        if self.max_trail:
+            prev_x = self.x.copy()
+        
+        # Desplazamiento horizontal con paralaje y movimiento sinusoidal suave
+        self.x -= self.velocity_x * dt
+        np.mod(self.x, self.width, out=self.x)
+        self.y += np.sin(current_time + self.blink_offset) * 0.5 * dt
+        np.mod(self.y, self.height, out=self.y)
+        
+        if self.max_trail:
+            self.trail_head = (self.trail_head - 1) % self.max_trail
+            self.trail_x[:, self.trail_head] = prev_x
+            self.trail_y[:, self.trail_head] = self.y
+            self.trail_filled = min(self.trail_filled + 1, self.max_trail)
+
+    def draw(self, screen: pygame.Surface, t: float) -> List[pygame.Rect]:
+        """Dibuja trails, resplandores y núcleos en tres lotes de blits.
+
+        Devuelve las áreas dibujadas para el renderizado por regiones sucias.
+        """
+        if not len(self.layer):
+            return []
+        rects = []
+        
+        # Calcular brillo con parpadeo suave
+        blink = (np.sin(t * 2 + self.blink_offset) + 1) * 0.5
+        glow = (math.sin(t * 3) + 1) * 0.3
+        alpha = 255 * (blink + glow)
+        levels = self.ALPHA_LEVELS - 1
+        alpha_level = np.rint(alpha / self.MAX_ALPHA * levels).astype(np.int64)
+        sprite_base = self.layer * self.ALPHA_LEVELS
+        
+        # Trails con desvanecimiento gradual
+        for age in range(self.trail_filled):
+            visible = np.flatnonzero(self.trail_length > age)
+            if not len(visible):
+                continue
+            column = (self.trail_head + age) % self.max_trail
+            fade = 1 - (age + 1) / (self.trail_length[visible] + 1)
+            trail_level = np.rint(alpha[visible] * fade * 0.5 / 255 * levels).astype(np.int64)
+            indices = (sprite_base[visible] + np.minimum(trail_level, levels)).tolist()
+            positions = zip(self.trail_x[visible, column].tolist(),
+                            self.trail_y[visible, column].tolist())
+            rects += screen.blits([(self.trail_sprites[i], pos)
+                                   for i, pos in zip(indices, positions)])
+        
+        # Resplandor con tamaño pulsante cuantizado
+        glow_level = np.rint((np.sin(t * 4 + self.blink_offset) + 1) * 0.5 *
+                             (self.GLOW_SIZE_LEVELS - 1)).astype(np.int64)
+        radius = self.glow_radius[self.layer, glow_level]
+        glow_indices = ((self.layer * self.GLOW_SIZE_LEVELS + glow_level) * self.ALPHA_LEVELS
+                        + alpha_level).tolist()
+        positions = zip((self.x - radius).tolist(), (self.y - radius).tolist())
+        rects += screen.blits([(self.glow_sprites[i], pos)
+                               for i, pos in zip(glow_indices, positions)])
+        
+        # Estrella central
+        core_indices = (sprite_base + alpha_level).tolist()
+        positions = zip((self.x - self.size / 2).tolist(), (self.y - self.size / 2).tolist())
+        rects += screen.blits([(self.core_sprites[i], pos)
+                               for i, pos in zip(core_indices, positions)])
+        return rects
 
 class RetroBackground:
-    _instance = None  # Singleton instance
-    
-    def __new__(cls, screen_width: int, screen_height: int):
-        """Implementación Singleton para evitar múltiples instancias"""
-        if cls._instance is None:
-            cls._instance = super(RetroBackground, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-
-    def __init__(self, screen_width: int, screen_height: int):
+    def __init__(self, screen_width: int, screen_height: int, star_density: float = 1.0):
         """Inicializa el fondo retro con gradiente y estrellas mejoradas."""
-        if self._initialized:
-            return
-            
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.time_active = 0.0
         
         # Paleta de colores NES extendida para gradiente más suave
         self.colors = [
@@ -45,15 +175,12 @@ class RetroBackground:
         
         # Crear superficie de caché para el gradiente
         self.gradient_surface = self._create_gradient_surface()
+        self.gradient_rows = np.arange(self.screen_height)
         
-        # Inicializar estrellas con trails
-        self.stars = self._init_stars()
-        self.star_trails: List[Dict] = []
-        
-        # Cache para las superficies de las estrellas
-        self.star_surfaces = self._create_star_surfaces()
-        
-        self._initialized = True
+        # Inicializar estrellas con trails (star_density multiplica la cantidad por capa)
+        self.starfield = Starfield(self.screen_width, self.screen_height,
+                                   self.star_layers, self.scroll_speed, star_density)
+
 
     def _generate_gradient_colors(self) -> List[Tuple[int, int, int]]:
         """Genera una lista de colores interpolados para un gradiente más suave"""
@@ -76,119 +203,99 @@ class RetroBackground:
         return gradient_colors
 
     def _create_gradient_surface(self) -> pygame.Surface:
-        """Crea una superficie pre-renderizada con el gradiente"""
-        surface = pygame.Surface((self.screen_width, self.screen_height))
+        """Crea una superficie pre-renderizada con el gradiente.
+
+        Tiene WAVE_MARGIN píxeles extra a cada lado para que la ondulación
+        horizontal siempre cubra la pantalla completa.
+        """
+        surface = pygame.Surface((self.screen_width + WAVE_MARGIN * 2, self.screen_height))
         
         for y, color in enumerate(self.gradient_colors):
-            pygame.draw.line(surface, color, (0, y), (self.screen_width, y))
+            surface.fill(color, (0, y, surface.get_width(), 1))
             
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
         return surface
 
-    def _create_star_surfaces(self) -> Dict[int, pygame.Surface]:
-        """Crea superficies pre-renderizadas para las estrellas"""
-        surfaces = {}
-        for layer in self.star_layers:
-            size = layer['size']
-            if size not in surfaces:
-                surf = pygame.Surface((size, size), pygame.SRCALPHA)
-                pygame.draw.circle(surf, (255, 255, 255), (size//2, size//2), size//2)
-                surfaces[size] = surf
-        return surfaces
-
-    def _init_stars(self) -> List[Dict]:
-        """Inicializa las estrellas con efectos mejorados"""
-        stars = []
-        for layer in self.star_layers:
-            for _ in range(layer['count']):
-                stars.append({
-                    'x': random.randint(0, self.screen_width),
-                    'y': random.randint(0, self.screen_height),
-                    'size': layer['size'],
-                    'speed': layer['speed'],
-                    'color': layer['color'],
-                    'blink_offset': random.random() * 6.28,
-                    'trail_length': layer['trail_length'],
-                    'trail': []
-                })
-        return stars
-
     def update(self, dt: float) -> None:
-        """Actualiza las animaciones del fondo con efectos mejorados"""
-        current_time = time.time()
+        """Actualiza las animaciones del fondo con el dt real del frame"""
+        self.time_active += dt
         
         # Actualizar estrellas con paralaje
-        for star in self.stars:
-            # Aplicar paralaje basado en el tamaño (las estrellas más grandes se mueven más rápido)
-            parallax_factor = star['size'] / 3
-            
-            # Actualizar posición con movimiento sinusoidal suave
-            prev_x = star['x']
-            star['x'] = (star['x'] - star['speed'] * self.scroll_speed * dt * parallax_factor) % self.screen_width
-            star['y'] += math.sin(current_time + star['blink_offset']) * 0.5 * dt
-            
-            # Mantener las estrellas dentro de la pantalla
-            star['y'] = star['y'] % self.screen_height
-            
-            # Actualizar trail con desvanecimiento
-            if star['trail_length'] > 0:
-                star['trail'].insert(0, (prev_x, star['y']))
-                if len(star['trail']) > star['trail_length']:
-                    star['trail'].pop()
-
-    def draw(self, screen: pygame.Surface) -> None:
-        """Dibuja el fondo con efectos mejorados"""
+        self.starfield.update(dt, self.time_active)
+
+    def draw(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """Dibuja el fondo con efectos mejorados.
+
+        El gradiente es uniforme en horizontal, así que la ondulación no cambia
+        ningún píxel visible: solo las estrellas cuentan como áreas sucias.
+        """
         # Dibujar gradiente con efecto de ondulación
-        t = time.time()
+        t = self.time_active
         wave_offset = math.sin(t * 0.5) * 2
         
-        for y, color in enumerate(self.gradient_colors):
-            # Aplicar ondulación al gradiente
-            wave = math.sin(y * 0.01 + t) * wave_offset
-            pygame.draw.line(screen, color, 
-                           (0 + wave, y),
-                           (self.screen_width + wave, y))
+        # Aplicar ondulación al gradiente: las filas con el mismo desplazamiento
+        # entero forman bandas que se copian con un solo blit cada una
+        waves = np.rint(np.sin(self.gradient_rows * 0.01 + t) * wave_offset).astype(int)
+        band_starts = [0] + (np.flatnonzero(np.diff(waves)) + 1).tolist()
+        band_ends = band_starts[1:] + [self.screen_height]
+        for start, end in zip(band_starts, band_ends):
+            source_x = WAVE_MARGIN - int(waves[start])
+            screen.blit(self.gradient_surface, (0, start),
+                        (source_x, start, self.screen_width, end - start))
         
         # Dibujar estrellas con efectos mejorados
-        for star in self.stars:
-            # Calcular brillo con parpadeo suave
-            blink = (math.sin(t * 2 + star['blink_offset']) + 1) * 0.5
-            glow = (math.sin(t * 3) + 1) * 0.3
-            alpha = int(255 * (blink + glow))
-            
-            # Dibujar trail con desvanecimiento gradual
-            if star['trail']:
-                points = [(star['x'], star['y'])] + star['trail']
-                for i in range(len(points) - 1):
-                    fade = 1 - (i / len(points))
-                    color = (*star['color'][:3], int(alpha * fade * 0.5))
-                    start = points[i]
-                    end = points[i + 1]
-                    pygame.draw.line(screen, color, start, end, 1)
-            
-            # Dibujar estrella con efecto de brillo
-            base_size = star['size']
-            glow_size = base_size * (1.5 + math.sin(t * 4 + star['blink_offset']) * 0.2)
-            
-            # Dibujar resplandor
-            glow_surf = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-            glow_color = (*star['color'][:3], int(alpha * 0.3))
-            pygame.draw.circle(glow_surf, glow_color,
-                            (glow_size, glow_size), glow_size)
-            screen.blit(glow_surf,
-                       (star['x'] - glow_size,
-                        star['y'] - glow_size))
-            
-            # Dibujar estrella central
-            star_surf = self.star_surfaces[base_size].copy()
-            star_surf.set_alpha(alpha)
-            screen.blit(star_surf,
-                       (star['x'] - base_size/2,
-                        star['y'] - base_size/2))
-
-def draw_gradient_background(screen: pygame.Surface) -> None:
+        return self.starfield.draw(screen, t)
+
+    def draw_gradient(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """Dibuja solo el gradiente, sin ondulación, para cachearlo en una capa estática"""
+        return [screen.blit(self.gradient_surface, (0, 0),
+                            (WAVE_MARGIN, 0, self.screen_width, self.screen_height))]
+
+    def draw_stars(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """Dibuja solo el campo de estrellas"""
+        return self.starfield.draw(screen, self.time_active)
+
+# Fondos ya construidos por resolución y resoluciones pendientes de construir.
+# Todo ocurre en el hilo principal: construir usa Surface.convert, que no es
+# seguro mientras otro hilo puede cambiar el modo de vídeo
+_backgrounds: Dict[Tuple[int, int], RetroBackground] = {}
+_pending_builds: List[Tuple[int, int]] = []
+
+def prepare_background(width: int, height: int) -> None:
+    """Encola el fondo de una resolución para construirlo en próximos frames"""
+    size = (width, height)
+    if size not in _backgrounds and size not in _pending_builds:
+        _pending_builds.append(size)
+
+def build_pending_backgrounds(limit: int = 1) -> None:
+    """Construye hasta `limit` fondos pendientes; se llama una vez por frame.
+
+    Si una construcción falla se descarta: `get_background` la reintentará
+    cuando se pida y mostrará el error real.
+    """
+    for _ in range(min(limit, len(_pending_builds))):
+        size = _pending_builds.pop(0)
+        try:
+            _backgrounds[size] = RetroBackground(*size)
+        except pygame.error:
+            continue
+
+def get_background(width: int, height: int) -> RetroBackground:
+    """Obtiene el fondo de una resolución, construyéndolo si aún no existe"""
+    size = (width, height)
+    background = _backgrounds.get(size)
+    if background is None:
+        if size in _pending_builds:
+            _pending_builds.remove(size)
+        background = RetroBackground(*size)
+        _backgrounds[size] = background
+    return background
+
+def draw_gradient_background(screen: pygame.Surface, dt: float = 1/60) -> List[pygame.Rect]:
     """Función de compatibilidad para dibujar el fondo retro."""
     width, height = screen.get_size()
-    # Usar singleton para evitar recrear el fondo
-    background = RetroBackground(width, height)
-    background.update(1/60)
-    background.draw(screen)
+    # Un fondo por resolución, así cambiar de tamaño no reutiliza el gradiente anterior
+    background = get_background(width, height)
+    background.update(dt)
+    return background.draw(screen)
@@ -0,0 +1,37 @@
+import numpy as np
+
+from Index.Utils.collision_helper import resolve_platform_collisions
+
+
+class _Size:
+    width = height = 32
+
+
+class _Body:
+    def __init__(self, x, y, velocity_y):
+        self.style = _Size()
+        self.x, self.y = x, y
+        self.velocity_x, self.velocity_y = 0.0, velocity_y
+        self.on_ground, self.is_jumping = False, True
+
+
+# Plataforma más fina que el desplazamiento de un paso largo
+THIN_PLATFORM = np.array([[0.0, 200.0, 800.0, 208.0]])
+
+
+def test_fast_fall_lands_on_thin_platform():
+    """Un cuerpo que cae de y=100 a y=300 en un paso aterriza encima"""
+    body = _Body(100.0, 300.0, 1200.0)
+    on_ground = resolve_platform_collisions([body], [(100.0, 100.0)], THIN_PLATFORM)
+    assert on_ground[0]
+    assert body.y == 168.0
+    assert body.velocity_y == 0.0
+
+
+def test_fast_rise_stops_below_thin_platform():
+    """Un cuerpo que sube de y=300 a y=100 en un paso se queda debajo"""
+    body = _Body(100.0, 100.0, -1200.0)
+    on_ground = resolve_platform_collisions([body], [(100.0, 300.0)], THIN_PLATFORM)
+    assert not on_ground[0]
+    assert body.y == 208.0
+    assert body.velocity_y == 0.0